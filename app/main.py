@@ -1,44 +1,45 @@
 import streamlit as st
-import sys
-import os
 
-# Add the scripts directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from scripts.dashboard import RealTimeHealthDashboard
 
-from dashboard import RealTimeHealthDashboard
-import time
+@st.cache_resource
+def get_dashboard():
+    """Build the dashboard once per process instead of on every rerun"""
+    return RealTimeHealthDashboard()
 
 def main():
     """Main application entry point"""
-    
-    # Initialize dashboard
-    dashboard = RealTimeHealthDashboard()
+
+    # Initialize dashboard (cached instance is shared across sessions,
+    # so per-run setup — page config, session state — still has to happen
+    # on every rerun; __init__ only did it for the very first one)
+    dashboard = get_dashboard()
+    dashboard.setup_page_config()
+    dashboard.initialize_session_state()
+    if 'baselines_df' not in st.session_state:
+        dashboard.load_user_baselines()
     
     # Create sidebar customization
     selected_metrics, viz_type, theme, time_range, update_freq = dashboard.create_customization_sidebar()
     dashboard.create_baseline_configuration()
-    
-    # Main dashboard layout
-    dashboard.create_adaptive_layout()
-    
-    # Alert system
-    dashboard.create_alert_system()
-    
+
     # Custom metrics builder
     dashboard.create_custom_metric_builder()
-    
-    # Auto-refresh functionality
-    if st.sidebar.checkbox("🔄 Enable Auto-Refresh"):
-        # Create a placeholder for the refresh timer
-        refresh_placeholder = st.sidebar.empty()
-        
-        # Countdown timer
-        for i in range(update_freq, 0, -1):
-            refresh_placeholder.text(f"Next refresh in: {i}s")
-            time.sleep(1)
-        
-        refresh_placeholder.empty()
-        st.rerun()
+
+    # Auto-refresh only reruns the plot fragment below, not the whole script
+    auto_refresh = st.sidebar.checkbox("🔄 Enable Auto-Refresh")
+    if auto_refresh:
+        st.sidebar.text(f"Refreshing every {update_freq}s")
+
+    @st.fragment(run_every=f"{update_freq}s" if auto_refresh else None)
+    def render_plots():
+        # Main dashboard layout
+        dashboard.create_adaptive_layout()
+
+        # Alert system
+        dashboard.create_alert_system()
+
+    render_plots()
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,94 @@
-def load_garmin_data(self, metric):
-    """Load real data from Garmin Connect API"""
-    # Example implementation
-    import requests
-    
-    # Your Garmin API credentials and endpoints
-    headers = {'Authorization': f'Bearer {your_token}'}
-    endpoint = f"https://healthapiapi.garmin.com/wellness-api/rest/{metric}"
-    
-    response = requests.get(endpoint, headers=headers)
-    data = response.json()
-    
+import asyncio
+import os
+import threading
+
+import aiohttp
+import pandas as pd
+import streamlit as st
+
+GARMIN_API_BASE = "https://healthapiapi.garmin.com/wellness-api/rest"
+
+# Retry transient failures a few times with exponential backoff
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@st.cache_resource
+def _get_loop():
+    """One persistent event loop on a daemon thread.
+
+    asyncio.run creates and closes a fresh loop per call, which would leave
+    the shared session's connector and timeout handles bound to a dead
+    loop; every fetch is submitted to this long-lived loop instead.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+@st.cache_resource
+def _get_session():
+    """Share one aiohttp session (and its connection pool) across fetches.
+
+    Constructed on the persistent loop so the session outlives any single
+    fetch call. Must be called from the script thread: on the loop thread
+    the blocking .result() below would wait on itself and deadlock.
+    """
+    async def _make():
+        return aiohttp.ClientSession(
+            headers={'Authorization': f"Bearer {os.environ.get('GARMIN_API_TOKEN', '')}"},
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+
+    return asyncio.run_coroutine_threadsafe(_make(), _get_loop()).result()
+
+
+def _run(coro):
+    """Run a coroutine on the persistent loop and block for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def _fetch_metric(session, metric):
+    """Fetch one wellness metric from the Garmin Connect API"""
+    endpoint = f"{GARMIN_API_BASE}/{metric}"
+
+    for attempt in range(RETRY_TOTAL + 1):
+        async with session.get(endpoint) as response:
+            if response.status in RETRY_STATUSES and attempt < RETRY_TOTAL:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+                continue
+            response.raise_for_status()
+            data = await response.json()
+            break
+
     # Convert to pandas Series with timestamps
     return pd.Series(data['values'], index=pd.to_datetime(data['timestamps']))
+
+
+async def _fetch_metrics(session, metrics):
+    """Fan out all metric requests concurrently and await the slowest one"""
+    return await asyncio.gather(*[_fetch_metric(session, m) for m in metrics])
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_metric_cached(metric):
+    """Serve repeat fetches of the same metric from cache within the TTL"""
+    return _run(_fetch_metric(_get_session(), metric))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_metrics_cached(metrics):
+    """Cached variant of the concurrent multi-metric fetch"""
+    return _run(_fetch_metrics(_get_session(), metrics))
+
+
+def load_garmin_data(self, metric):
+    """Load real data from Garmin Connect API"""
+    return _fetch_metric_cached(metric)
+
+
+def load_all_garmin_data(self, metrics):
+    """Load all requested metrics concurrently instead of one RTT at a time"""
+    return _fetch_metrics_cached(tuple(metrics))
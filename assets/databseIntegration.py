@@ -1,16 +1,212 @@
-def load_data_from_db(self, metric):
-    """Load data from database"""
-    import sqlite3
-    
-    conn = sqlite3.connect('data/health_metrics.db')
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from cachetools import TTLCache
+
+# Allow-list of metric columns that may be interpolated into queries
+KNOWN_METRICS = frozenset([
+    'heart_rate', 'steps', 'sleep_efficiency', 'hrv_score',
+    'stress_level', 'spo2', 'calories', 'active_minutes',
+    'body_battery', 'respiration_rate'
+])
+
+
+@st.cache_resource
+def _get_connection():
+    """Open one shared read-only connection instead of one per query"""
+    conn = sqlite3.connect('data/health_metrics.db', check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')  # 256MB memory-mapped I/O
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_health_ts ON health_data(timestamp)')
+    # Covering indexes let the range queries be answered from the index
+    # alone, without a table B-tree lookup per matching row
+    for metric in KNOWN_METRICS:
+        conn.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_ts_{metric} ON health_data(timestamp, {metric})'
+        )
+    conn.execute('PRAGMA query_only=1')
+    return conn
+
+
+# Cap on how many points a chart needs; wider windows get coarser buckets
+MAX_CHART_POINTS = 1000
+
+
+def _bucket_seconds(hours):
+    """Pick a bucket size that keeps the returned series under the point cap"""
+    return max(1, hours * 3600 // MAX_CHART_POINTS)
+
+
+@lru_cache(maxsize=None)
+def _metric_query(metric):
+    """Build (once per metric) the parameterized range query so SQLite can
+    reuse its prepared-statement cache instead of re-parsing each call"""
+    if metric not in KNOWN_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    return f"""
+    SELECT (timestamp / ?) * ? AS ts, AVG({metric})
+    FROM health_data
+    WHERE timestamp >= ?
+    GROUP BY ts
+    ORDER BY ts
+    """
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def has_data(hours):
+    """Cheap EXISTS probe so empty windows can skip the query and render"""
+    conn = _get_connection()
+    cutoff = int(time.time()) - hours * 3600
+    row = conn.execute(
+        'SELECT EXISTS(SELECT 1 FROM health_data WHERE timestamp >= ?)', (cutoff,)
+    ).fetchone()
+    return bool(row[0])
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_metric(metric, hours):
+    """Load a metric series from the database, cached per (metric, hours)"""
+    query = _metric_query(metric)
+
+    if not has_data(hours):
+        return pd.Series(name=metric, dtype=np.float32)
+
+    conn = _get_connection()
+    # timestamp is stored as INTEGER unix seconds, so the cutoff is computed
+    # once here and the filter stays a plain indexed range comparison
+    cutoff = int(time.time()) - hours * 3600
+    # Aggregate into time buckets at query time so only ~MAX_CHART_POINTS
+    # rows ever cross the SQLite -> Python boundary
+    bucket = _bucket_seconds(hours)
+
+    # Build the Series straight from the cursor: two typed arrays and one
+    # vectorized epoch conversion, skipping read_sql_query's row-by-row
+    # parsing and the intermediate DataFrame
+    rows = conn.execute(query, (bucket, bucket, cutoff)).fetchall()
+    ts, vals = zip(*rows) if rows else ((), ())
+    # float32 is plenty of precision for health metrics and halves the
+    # memory and Plotly serialization cost of each series
+    return pd.Series(
+        np.fromiter(vals, dtype=np.float32, count=len(vals)),
+        index=pd.to_datetime(np.fromiter(ts, dtype=np.int64, count=len(ts)), unit='s'),
+        name=metric
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_metric_frame(metrics, hours):
+    """Load all requested metric columns with a single range query"""
+    unknown = [m for m in metrics if m not in KNOWN_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {unknown}")
+
+    if not has_data(hours):
+        return pd.DataFrame(columns=list(metrics))
+
+    conn = _get_connection()
+    cutoff = int(time.time()) - hours * 3600
+    bucket = _bucket_seconds(hours)
+    avg_cols = ', '.join(f'AVG({m}) AS {m}' for m in metrics)
     query = f"""
-    SELECT timestamp, {metric} 
-    FROM health_data 
-    WHERE timestamp >= datetime('now', '-{self.get_hours_for_timerange()} hours')
-    ORDER BY timestamp
+    SELECT (timestamp / ?) * ? AS ts, {avg_cols}
+    FROM health_data
+    WHERE timestamp >= ?
+    GROUP BY ts
+    ORDER BY ts
     """
-    
-    df = pd.read_sql_query(query, conn, parse_dates=['timestamp'], index_col='timestamp')
-    conn.close()
-    
-    return df[metric]
+
+    df = pd.read_sql_query(query, conn, params=[bucket, bucket, cutoff])
+    # One vectorized epoch conversion beats per-row parsing in read_sql_query
+    df.index = pd.to_datetime(df.pop('ts'), unit='s', cache=True)
+    return df.astype(np.float32, copy=False)
+
+
+def ensure_bucketed_schema(conn):
+    """Create the hour-bucketed clustered table used once histories get large"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS health_data_bucketed (
+        metric TEXT NOT NULL,
+        hour_bin INTEGER NOT NULL,
+        ts_offset INTEGER NOT NULL,
+        value REAL NOT NULL,
+        PRIMARY KEY (metric, hour_bin, ts_offset)
+    ) WITHOUT ROWID
+    ''')
+
+
+def insert_bucketed(conn, metric, timestamp, value):
+    """Store a sample keyed by (metric, hour bucket, offset within the hour)"""
+    conn.execute(
+        'INSERT OR REPLACE INTO health_data_bucketed VALUES (?, ?, ?, ?)',
+        (metric, timestamp // 3600, timestamp % 3600, value)
+    )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_metric_bucketed(metric, hours):
+    """Load one metric from the bucketed table with a contiguous bucket scan"""
+    if metric not in KNOWN_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+
+    conn = _get_connection()
+    end = int(time.time())
+    start = end - hours * 3600
+    lo_bin, lo_off = divmod(start, 3600)
+    hi_bin, hi_off = divmod(end, 3600)
+
+    # The primary key clusters rows by (metric, hour_bin, ts_offset), so the
+    # window is a sequential scan over adjacent hour buckets with only the
+    # two edge buckets needing the offset predicates
+    rows = conn.execute('''
+        SELECT hour_bin * 3600 + ts_offset AS ts, value
+        FROM health_data_bucketed
+        WHERE metric = ?
+          AND hour_bin BETWEEN ? AND ?
+          AND (hour_bin > ? OR ts_offset >= ?)
+          AND (hour_bin < ? OR ts_offset <= ?)
+        ORDER BY hour_bin, ts_offset
+    ''', (metric, lo_bin, hi_bin, lo_bin, lo_off, hi_bin, hi_off)).fetchall()
+
+    ts, vals = zip(*rows) if rows else ((), ())
+    return pd.Series(
+        np.fromiter(vals, dtype=np.float32, count=len(vals)),
+        index=pd.to_datetime(np.fromiter(ts, dtype=np.int64, count=len(ts)), unit='s'),
+        name=metric
+    )
+
+
+# Process-wide second cache layer: st.cache_data can be scoped per user in
+# some deployments, but this dict is shared by every session in the worker
+_metric_cache = TTLCache(maxsize=256, ttl=30)
+# cachetools caches are not thread-safe, and concurrent sessions are the
+# whole point of this layer; serialize access the same way
+# HealthDataManager._cached does
+_metric_cache_lock = threading.Lock()
+
+
+def _load_metric_shared(metric, hours):
+    """Serve (metric, hours) from the process-wide cache when possible"""
+    key = (metric, hours)
+    with _metric_cache_lock:
+        series = _metric_cache.get(key)
+    if series is None:
+        series = _load_metric(metric, hours)
+        with _metric_cache_lock:
+            _metric_cache[key] = series
+    return series
+
+
+def load_data_from_db(self, metric):
+    """Load data from database"""
+    return _load_metric_shared(metric, self.get_hours_for_timerange())
+
+
+def load_metrics(self, metrics):
+    """Load several metrics in one query instead of one query per metric"""
+    return _load_metric_frame(tuple(metrics), self.get_hours_for_timerange())
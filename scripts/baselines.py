@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import seaborn as sns
 import pandas as pd
 import numpy as np
@@ -6,81 +7,193 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:  # numba is optional; the matmul path below is the fallback
+    HAS_NUMBA = False
+
 # Set up plotting style
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
+# Decimate dense line paths before stroking them; invisible at dashboard
+# scale but much less geometry for the renderer
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+
+# PCG64 generator, seeded once at import: faster draws than the legacy
+# Mersenne Twister globals and reproducible synthetic dashboards
+rng = np.random.default_rng(42)
+
+# Per-column (mean, std, clip-low, clip-high) for the synthetic metrics,
+# laid out as arrays so one broadcasted draw covers every column
+_HEALTH_COLUMNS = ['steps', 'active_minutes', 'calories', 'sleep_hours',
+                   'sleep_efficiency', 'deep_sleep_pct', 'resting_hr',
+                   'hrv_score', 'stress_avg', 'spo2_avg']
+_HEALTH_MU = np.array([8500, 45, 2200, 7.5, 85, 20, 65, 35, 35, 97], dtype=np.float64)
+_HEALTH_SIGMA = np.array([2000, 15, 300, 1, 8, 5, 8, 8, 15, 2], dtype=np.float64)
+_HEALTH_LO = np.array([2000, 10, 1500, 4, 60, 10, 45, 15, 5, 92], dtype=np.float64)
+_HEALTH_HI = np.array([15000, 120, 3500, 10, 98, 35, 85, 60, 80, 100], dtype=np.float64)
+
+_ACTIVITY_COLUMNS = ['distance_km', 'duration_min', 'avg_pace_min_km',
+                     'avg_hr', 'calories_burned', 'elevation_gain']
+_ACTIVITY_MU = np.array([5.5, 35, 5.2, 155, 350, 120], dtype=np.float64)
+_ACTIVITY_SIGMA = np.array([2, 10, 0.8, 15, 100, 50], dtype=np.float64)
+_ACTIVITY_LO = np.array([1, 15, 3.5, 120, 150, 0], dtype=np.float64)
+_ACTIVITY_HI = np.array([15, 80, 7.5, 190, 700, 300], dtype=np.float64)
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _derive_scores(steps, active, hrv, se, rhr, stress, out):
+        """Fused elementwise kernel for the four derived health columns"""
+        for i in prange(steps.shape[0]):
+            a = (steps[i] / 10000) * 0.4 + (active[i] / 60) * 0.6
+            out[i, 0] = a
+            out[i, 1] = active[i] / (24 * 60) * 100
+            out[i, 2] = hrv[i] * 0.4 + se[i] * 0.3 + (100 - rhr[i]) * 0.3
+            out[i, 3] = se[i] * 0.3 + hrv[i] * 0.2 + a * 30 + (100 - stress[i]) * 0.2
+
+def _move_mean(values, window):
+    """O(n) trailing moving mean via a differenced running sum.
+
+    NaN for the first window-1 slots, matching Series.rolling(window).mean(),
+    but a single cumsum pass instead of the pandas rolling engine.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        csum = np.cumsum(values, dtype=np.float64)
+        csum[window:] = csum[window:] - csum[:-window]
+        out[window - 1:] = csum[window - 1:] / window
+    return out
 
 # Generate sample data for demonstration
 def generate_sample_data(days=90):
     dates = pd.date_range(start='2024-01-01', periods=days, freq='D')
-    
-    # Health metrics data
-    health_data = {
-        'date': dates,
-        'steps': np.random.normal(8500, 2000, days).clip(2000, 15000),
-        'active_minutes': np.random.normal(45, 15, days).clip(10, 120),
-        'calories': np.random.normal(2200, 300, days).clip(1500, 3500),
-        'sleep_hours': np.random.normal(7.5, 1, days).clip(4, 10),
-        'sleep_efficiency': np.random.normal(85, 8, days).clip(60, 98),
-        'deep_sleep_pct': np.random.normal(20, 5, days).clip(10, 35),
-        'resting_hr': np.random.normal(65, 8, days).clip(45, 85),
-        'hrv_score': np.random.normal(35, 8, days).clip(15, 60),
-        'stress_avg': np.random.normal(35, 15, days).clip(5, 80),
-        'spo2_avg': np.random.normal(97, 2, days).clip(92, 100),
-    }
-    
-    # Activity metrics data (3x per week)
-    activity_dates = dates[::2]  # Every other day
-    activity_data = {
-        'date': activity_dates,
-        'distance_km': np.random.normal(5.5, 2, len(activity_dates)).clip(1, 15),
-        'duration_min': np.random.normal(35, 10, len(activity_dates)).clip(15, 80),
-        'avg_pace_min_km': np.random.normal(5.2, 0.8, len(activity_dates)).clip(3.5, 7.5),
-        'avg_hr': np.random.normal(155, 15, len(activity_dates)).clip(120, 190),
-        'calories_burned': np.random.normal(350, 100, len(activity_dates)).clip(150, 700),
-        'elevation_gain': np.random.normal(120, 50, len(activity_dates)).clip(0, 300),
-    }
-    
-    return pd.DataFrame(health_data), pd.DataFrame(activity_data)
+
+    # Health metrics: one (days, K) standard-normal draw scaled/shifted per
+    # column and clipped in a single broadcasted pass, instead of ten
+    # separate per-column draws each allocating its own array
+    Z = rng.standard_normal((days, len(_HEALTH_COLUMNS)))
+    X = np.clip(_HEALTH_MU + _HEALTH_SIGMA * Z, _HEALTH_LO, _HEALTH_HI)
+    health_df = pd.DataFrame(X, columns=_HEALTH_COLUMNS)
+    health_df.insert(0, 'date', dates)
+
+    # Activity metrics (every other day), same single-matrix layout
+    activity_dates = dates[::2]
+    Z = rng.standard_normal((len(activity_dates), len(_ACTIVITY_COLUMNS)))
+    A = np.clip(_ACTIVITY_MU + _ACTIVITY_SIGMA * Z, _ACTIVITY_LO, _ACTIVITY_HI)
+    activity_df = pd.DataFrame(A, columns=_ACTIVITY_COLUMNS)
+    activity_df.insert(0, 'date', activity_dates)
+
+    return health_df, activity_df
 
 # Calculate derived metrics
 def calculate_derived_metrics(health_df, activity_df):
-    # Health-derived metrics
-    health_df['activity_score'] = (health_df['steps'] / 10000) * 0.4 + (health_df['active_minutes'] / 60) * 0.6
-    health_df['movement_ratio'] = health_df['active_minutes'] / (24 * 60) * 100
-    health_df['recovery_score'] = (health_df['hrv_score'] * 0.4 + health_df['sleep_efficiency'] * 0.3 + 
-                                  (100 - health_df['resting_hr']) * 0.3)
-    health_df['wellness_score'] = (health_df['sleep_efficiency'] * 0.3 + health_df['hrv_score'] * 0.2 + 
-                                  health_df['activity_score'] * 30 + (100 - health_df['stress_avg']) * 0.2)
-    
+    # Pull the inputs out as ndarrays once; the derived columns are then
+    # plain array arithmetic with no intermediate pandas Series or repeated
+    # label-based indexing
+    steps = health_df['steps'].to_numpy()
+    active_minutes = health_df['active_minutes'].to_numpy()
+    hrv = health_df['hrv_score'].to_numpy()
+    sleep_eff = health_df['sleep_efficiency'].to_numpy()
+    resting_hr = health_df['resting_hr'].to_numpy()
+    stress = health_df['stress_avg'].to_numpy()
+
+    if HAS_NUMBA:
+        # One fused, parallel pass over the rows: all four derived columns
+        # come out of a single loop with no intermediate arrays
+        out = np.empty((len(health_df), 4))
+        _derive_scores(steps, active_minutes, hrv, sleep_eff, resting_hr, stress, out)
+        health_df['activity_score'] = out[:, 0]
+        health_df['movement_ratio'] = out[:, 1]
+        health_df['recovery_score'] = out[:, 2]
+        health_df['wellness_score'] = out[:, 3]
+    else:
+        # The three composite scores are affine combinations of the same six
+        # inputs, so a single matmul produces all of them at once instead of
+        # a chain of column multiplies each allocating its own temporary.
+        # Weights fold in the original formulas: wellness includes
+        # activity_score * 30, and the (100 - x) terms become a negative
+        # weight plus a constant in the bias row.
+        X = np.column_stack([steps, active_minutes, hrv, sleep_eff, resting_hr, stress])
+        #              activity      recovery  wellness
+        W = np.array([[0.4 / 10000,  0.0,      30 * 0.4 / 10000],  # steps
+                      [0.6 / 60,     0.0,      30 * 0.6 / 60],     # active_minutes
+                      [0.0,          0.4,      0.2],               # hrv_score
+                      [0.0,          0.3,      0.3],               # sleep_efficiency
+                      [0.0,         -0.3,      0.0],               # resting_hr
+                      [0.0,          0.0,     -0.2]])              # stress_avg
+        bias = np.array([0.0, 100 * 0.3, 100 * 0.2])
+        scores = X @ W + bias
+
+        health_df['activity_score'] = scores[:, 0]
+        health_df['movement_ratio'] = active_minutes / (24 * 60) * 100
+        health_df['recovery_score'] = scores[:, 1]
+        health_df['wellness_score'] = scores[:, 2]
+
     # Activity-derived metrics
-    activity_df['pace_consistency'] = 1 - (np.random.normal(0.15, 0.05, len(activity_df))).clip(0.05, 0.4)
-    activity_df['intensity_factor'] = activity_df['avg_hr'] / 170  # Assuming threshold HR of 170
-    activity_df['caloric_efficiency'] = activity_df['distance_km'] / activity_df['calories_burned'] * 1000
-    activity_df['elevation_efficiency'] = activity_df['elevation_gain'] / activity_df['distance_km']
-    
+    distance = activity_df['distance_km'].to_numpy()
+    avg_hr = activity_df['avg_hr'].to_numpy()
+    calories = activity_df['calories_burned'].to_numpy()
+    elevation = activity_df['elevation_gain'].to_numpy()
+
+    # Chain the ufuncs in place on one buffer per column so each derived
+    # column costs a single allocation instead of a temporary per operator
+    pace = rng.standard_normal(len(activity_df))
+    pace *= 0.05
+    pace += 0.15  # equivalent to rng.normal(0.15, 0.05, n)
+    np.clip(pace, 0.05, 0.4, out=pace)
+    np.subtract(1.0, pace, out=pace)
+    activity_df['pace_consistency'] = pace
+
+    activity_df['intensity_factor'] = avg_hr / 170  # Assuming threshold HR of 170
+
+    caloric = distance / calories
+    caloric *= 1000
+    activity_df['caloric_efficiency'] = caloric
+
+    activity_df['elevation_efficiency'] = elevation / distance
+
+    # ISO week number, computed once here; both dashboards group on it and
+    # isocalendar() is an O(N) datetime decomposition worth not repeating
+    health_df['week'] = health_df['date'].dt.isocalendar().week.to_numpy(dtype=np.int16)
+    activity_df['week'] = activity_df['date'].dt.isocalendar().week.to_numpy(dtype=np.int16)
+
     return health_df, activity_df
 
 # Establish baselines
 def establish_baselines(health_df, activity_df):
+    # Every percentile the baselines need, computed in one np.quantile call
+    # per frame: each column is sorted once and all probabilities are read
+    # off that sort, instead of re-sorting for every .quantile()/.median()
+    probs = [0.25, 0.3, 0.5, 0.75, 0.8, 0.9]
+    row = {p: i for i, p in enumerate(probs)}
+    cols = ['steps', 'hrv_score', 'wellness_score', 'recovery_score']
+    q = dict(zip(cols, np.quantile(health_df[cols].to_numpy(), probs, axis=0).T))
+
     # Health baselines (using percentiles and targets)
     health_baselines = {
-        'steps': {'target': 10000, 'good': health_df['steps'].quantile(0.75), 'poor': health_df['steps'].quantile(0.25)},
+        'steps': {'target': 10000, 'good': q['steps'][row[0.75]], 'poor': q['steps'][row[0.25]]},
         'sleep_efficiency': {'target': 85, 'good': 80, 'poor': 70},
-        'hrv_score': {'target': health_df['hrv_score'].quantile(0.75), 'good': health_df['hrv_score'].median(), 'poor': health_df['hrv_score'].quantile(0.25)},
+        'hrv_score': {'target': q['hrv_score'][row[0.75]], 'good': q['hrv_score'][row[0.5]], 'poor': q['hrv_score'][row[0.25]]},
         'stress_avg': {'target': 25, 'good': 35, 'poor': 50},
-        'wellness_score': {'target': health_df['wellness_score'].quantile(0.9), 'good': health_df['wellness_score'].quantile(0.75), 'poor': health_df['wellness_score'].quantile(0.25)},
-        'recovery_score': {'target': health_df['recovery_score'].quantile(0.8), 'good': health_df['recovery_score'].median(), 'poor': health_df['recovery_score'].quantile(0.3)}
+        'wellness_score': {'target': q['wellness_score'][row[0.9]], 'good': q['wellness_score'][row[0.75]], 'poor': q['wellness_score'][row[0.25]]},
+        'recovery_score': {'target': q['recovery_score'][row[0.8]], 'good': q['recovery_score'][row[0.5]], 'poor': q['recovery_score'][row[0.3]]}
     }
-    
+
+    a_probs = [0.25, 0.5, 0.75]
+    a_row = {p: i for i, p in enumerate(a_probs)}
+    a_cols = ['avg_pace_min_km', 'caloric_efficiency']
+    aq = dict(zip(a_cols, np.quantile(activity_df[a_cols].to_numpy(), a_probs, axis=0).T))
+
     # Activity baselines
     activity_baselines = {
-        'avg_pace_min_km': {'target': activity_df['avg_pace_min_km'].quantile(0.25), 'good': activity_df['avg_pace_min_km'].median(), 'poor': activity_df['avg_pace_min_km'].quantile(0.75)},
+        'avg_pace_min_km': {'target': aq['avg_pace_min_km'][a_row[0.25]], 'good': aq['avg_pace_min_km'][a_row[0.5]], 'poor': aq['avg_pace_min_km'][a_row[0.75]]},
         'intensity_factor': {'target': 0.9, 'good': 0.8, 'poor': 0.7},
         'pace_consistency': {'target': 0.9, 'good': 0.8, 'poor': 0.7},
-        'caloric_efficiency': {'target': activity_df['caloric_efficiency'].quantile(0.75), 'good': activity_df['caloric_efficiency'].median(), 'poor': activity_df['caloric_efficiency'].quantile(0.25)}
+        'caloric_efficiency': {'target': aq['caloric_efficiency'][a_row[0.75]], 'good': aq['caloric_efficiency'][a_row[0.5]], 'poor': aq['caloric_efficiency'][a_row[0.25]]}
     }
-    
+
     return health_baselines, activity_baselines
 
 # Generate data
@@ -88,87 +201,49 @@ health_df, activity_df = generate_sample_data(90)
 health_df, activity_df = calculate_derived_metrics(health_df, activity_df)
 health_baselines, activity_baselines = establish_baselines(health_df, activity_df)
 
+# Panels 1-6 of the health dashboard share one structure and only differ
+# in column, color, titles and which baseline band gets shaded
+_HEALTH_PANELS = [
+    ('steps', None, 'Daily Steps', 'Steps', ('poor', 'good'), 'yellow'),
+    ('sleep_efficiency', 'purple', 'Sleep Efficiency (%)', 'Efficiency %', ('poor', 'good'), 'purple'),
+    ('hrv_score', 'blue', 'Heart Rate Variability', 'HRV Score', ('poor', 'good'), 'blue'),
+    ('stress_avg', 'red', 'Average Daily Stress', 'Stress Level', ('target', 'good'), 'green'),
+    ('recovery_score', 'cyan', 'Recovery Score', 'Recovery Score', ('poor', 'good'), 'cyan'),
+    ('wellness_score', 'magenta', 'Overall Wellness Score', 'Wellness Score', ('poor', 'good'), 'magenta'),
+]
+
 # Create comprehensive visualization dashboard
 def create_health_dashboard(health_df, health_baselines):
-    fig, axes = plt.subplots(3, 3, figsize=(20, 15))
+    fig, axes = plt.subplots(3, 3, figsize=(20, 15), layout='constrained')
     fig.suptitle('Garmin Health Metrics Dashboard', fontsize=16, fontweight='bold')
-    
-    # 1. Daily Steps with baseline
-    ax = axes[0, 0]
-    ax.plot(health_df['date'], health_df['steps'], linewidth=2, label='Daily Steps')
-    ax.axhline(y=health_baselines['steps']['target'], color='green', linestyle='--', alpha=0.7, label='Target (10K)')
-    ax.axhline(y=health_baselines['steps']['good'], color='orange', linestyle='--', alpha=0.7, label='Good')
-    ax.axhline(y=health_baselines['steps']['poor'], color='red', linestyle='--', alpha=0.7, label='Poor')
-    ax.fill_between(health_df['date'], health_baselines['steps']['poor'], health_baselines['steps']['good'], alpha=0.2, color='yellow')
-    ax.set_title('Daily Steps')
-    ax.set_ylabel('Steps')
-    ax.legend(fontsize=8)
-    ax.tick_params(axis='x', rotation=45)
-    
-    # 2. Sleep Efficiency
-    ax = axes[0, 1]
-    ax.plot(health_df['date'], health_df['sleep_efficiency'], linewidth=2, color='purple', label='Sleep Efficiency')
-    ax.axhline(y=health_baselines['sleep_efficiency']['target'], color='green', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['sleep_efficiency']['good'], color='orange', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['sleep_efficiency']['poor'], color='red', linestyle='--', alpha=0.7)
-    ax.fill_between(health_df['date'], health_baselines['sleep_efficiency']['poor'], 
-                    health_baselines['sleep_efficiency']['good'], alpha=0.2, color='purple')
-    ax.set_title('Sleep Efficiency (%)')
-    ax.set_ylabel('Efficiency %')
-    ax.tick_params(axis='x', rotation=45)
-    
-    # 3. HRV Score
-    ax = axes[0, 2]
-    ax.plot(health_df['date'], health_df['hrv_score'], linewidth=2, color='blue', label='HRV Score')
-    ax.axhline(y=health_baselines['hrv_score']['target'], color='green', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['hrv_score']['good'], color='orange', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['hrv_score']['poor'], color='red', linestyle='--', alpha=0.7)
-    ax.fill_between(health_df['date'], health_baselines['hrv_score']['poor'], 
-                    health_baselines['hrv_score']['good'], alpha=0.2, color='blue')
-    ax.set_title('Heart Rate Variability')
-    ax.set_ylabel('HRV Score')
-    ax.tick_params(axis='x', rotation=45)
-    
-    # 4. Stress Levels
-    ax = axes[1, 0]
-    ax.plot(health_df['date'], health_df['stress_avg'], linewidth=2, color='red', label='Avg Stress')
-    ax.axhline(y=health_baselines['stress_avg']['target'], color='green', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['stress_avg']['good'], color='orange', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['stress_avg']['poor'], color='red', linestyle='--', alpha=0.7)
-    ax.fill_between(health_df['date'], health_baselines['stress_avg']['target'], 
-                    health_baselines['stress_avg']['good'], alpha=0.2, color='green')
-    ax.set_title('Average Daily Stress')
-    ax.set_ylabel('Stress Level')
-    ax.tick_params(axis='x', rotation=45)
-    
-    # 5. Recovery Score
-    ax = axes[1, 1]
-    ax.plot(health_df['date'], health_df['recovery_score'], linewidth=2, color='cyan', label='Recovery Score')
-    ax.axhline(y=health_baselines['recovery_score']['target'], color='green', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['recovery_score']['good'], color='orange', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['recovery_score']['poor'], color='red', linestyle='--', alpha=0.7)
-    ax.fill_between(health_df['date'], health_baselines['recovery_score']['poor'], 
-                    health_baselines['recovery_score']['good'], alpha=0.2, color='cyan')
-    ax.set_title('Recovery Score')
-    ax.set_ylabel('Recovery Score')
-    ax.tick_params(axis='x', rotation=45)
-    
-    # 6. Overall Wellness Score
-    ax = axes[1, 2]
-    ax.plot(health_df['date'], health_df['wellness_score'], linewidth=2, color='magenta', label='Wellness Score')
-    ax.axhline(y=health_baselines['wellness_score']['target'], color='green', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['wellness_score']['good'], color='orange', linestyle='--', alpha=0.7)
-    ax.axhline(y=health_baselines['wellness_score']['poor'], color='red', linestyle='--', alpha=0.7)
-    ax.fill_between(health_df['date'], health_baselines['wellness_score']['poor'], 
-                    health_baselines['wellness_score']['good'], alpha=0.2, color='magenta')
-    ax.set_title('Overall Wellness Score')
-    ax.set_ylabel('Wellness Score')
-    ax.tick_params(axis='x', rotation=45)
-    
+
+    # 1-6. Metric-over-time panels, driven by the config table above.
+    # hlines draws the three baseline levels as one collection artist per
+    # panel instead of three separate axhline paths
+    dates = health_df['date'].to_numpy()
+    for ax, (col, color, title, ylabel, band, band_color) in zip(axes.flat, _HEALTH_PANELS):
+        base = health_baselines[col]
+        ax.plot(dates, health_df[col].to_numpy(), linewidth=2, color=color)
+        ax.hlines([base['target'], base['good'], base['poor']], dates[0], dates[-1],
+                  colors=['green', 'orange', 'red'], linestyles='--', alpha=0.7)
+        ax.fill_between(dates, base[band[0]], base[band[1]], alpha=0.2, color=band_color, rasterized=True)
+        ax.set_title(title)
+        ax.set_ylabel(ylabel)
+        ax.tick_params(axis='x', rotation=45)
+
+    # Legend on the first panel only, as before; proxy handles because the
+    # batched hlines collection can't carry three separate labels
+    axes[0, 0].legend(handles=[
+        Line2D([], [], color='C0', linewidth=2, label='Daily Steps'),
+        Line2D([], [], color='green', linestyle='--', alpha=0.7, label='Target (10K)'),
+        Line2D([], [], color='orange', linestyle='--', alpha=0.7, label='Good'),
+        Line2D([], [], color='red', linestyle='--', alpha=0.7, label='Poor'),
+    ], fontsize=8)
+
     # 7. Sleep vs Recovery correlation
     ax = axes[2, 0]
     scatter = ax.scatter(health_df['sleep_efficiency'], health_df['recovery_score'], 
-                        c=health_df['hrv_score'], cmap='viridis', alpha=0.6)
+                        c=health_df['hrv_score'], cmap='viridis', alpha=0.6, rasterized=True)
     ax.set_xlabel('Sleep Efficiency (%)')
     ax.set_ylabel('Recovery Score')
     ax.set_title('Sleep vs Recovery (colored by HRV)')
@@ -176,7 +251,6 @@ def create_health_dashboard(health_df, health_baselines):
     
     # 8. Weekly averages heatmap
     ax = axes[2, 1]
-    health_df['week'] = health_df['date'].dt.isocalendar().week
     weekly_data = health_df.groupby('week')[['steps', 'sleep_efficiency', 'hrv_score', 'stress_avg']].mean()
     sns.heatmap(weekly_data.T, annot=True, fmt='.1f', cmap='RdYlGn', ax=ax)
     ax.set_title('Weekly Averages Heatmap')
@@ -185,8 +259,8 @@ def create_health_dashboard(health_df, health_baselines):
     # 9. Trend analysis
     ax = axes[2, 2]
     # Calculate 7-day rolling averages
-    health_df['wellness_7d'] = health_df['wellness_score'].rolling(7).mean()
-    health_df['recovery_7d'] = health_df['recovery_score'].rolling(7).mean()
+    health_df['wellness_7d'] = _move_mean(health_df['wellness_score'].to_numpy(), 7)
+    health_df['recovery_7d'] = _move_mean(health_df['recovery_score'].to_numpy(), 7)
     
     ax.plot(health_df['date'], health_df['wellness_7d'], label='Wellness (7d avg)', linewidth=2)
     ax.plot(health_df['date'], health_df['recovery_7d'], label='Recovery (7d avg)', linewidth=2)
@@ -195,11 +269,10 @@ def create_health_dashboard(health_df, health_baselines):
     ax.legend()
     ax.tick_params(axis='x', rotation=45)
     
-    plt.tight_layout()
     return fig
 
 def create_activity_dashboard(activity_df, activity_baselines):
-    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12), layout='constrained')
     fig.suptitle('Garmin Activity Metrics Dashboard', fontsize=16, fontweight='bold')
     
     # 1. Pace over time
@@ -209,7 +282,7 @@ def create_activity_dashboard(activity_df, activity_baselines):
     ax.axhline(y=activity_baselines['avg_pace_min_km']['good'], color='orange', linestyle='--', alpha=0.7, label='Good')
     ax.axhline(y=activity_baselines['avg_pace_min_km']['poor'], color='red', linestyle='--', alpha=0.7, label='Poor')
     ax.fill_between(activity_df['date'], activity_baselines['avg_pace_min_km']['good'], 
-                    activity_baselines['avg_pace_min_km']['poor'], alpha=0.2, color='yellow')
+                    activity_baselines['avg_pace_min_km']['poor'], alpha=0.2, color='yellow', rasterized=True)
     ax.set_title('Average Pace Progression')
     ax.set_ylabel('Pace (min/km)')
     ax.legend(fontsize=8)
@@ -218,7 +291,7 @@ def create_activity_dashboard(activity_df, activity_baselines):
     # 2. Distance vs Calories
     ax = axes[0, 1]
     scatter = ax.scatter(activity_df['distance_km'], activity_df['calories_burned'], 
-                        c=activity_df['avg_hr'], cmap='plasma', alpha=0.7, s=60)
+                        c=activity_df['avg_hr'], cmap='plasma', alpha=0.7, s=60, rasterized=True)
     ax.set_xlabel('Distance (km)')
     ax.set_ylabel('Calories Burned')
     ax.set_title('Distance vs Calories (colored by HR)')
@@ -231,7 +304,7 @@ def create_activity_dashboard(activity_df, activity_baselines):
     ax.axhline(y=activity_baselines['intensity_factor']['good'], color='orange', linestyle='--', alpha=0.7)
     ax.axhline(y=activity_baselines['intensity_factor']['poor'], color='red', linestyle='--', alpha=0.7)
     ax.fill_between(activity_df['date'], activity_baselines['intensity_factor']['poor'], 
-                    activity_baselines['intensity_factor']['good'], alpha=0.2, color='red')
+                    activity_baselines['intensity_factor']['good'], alpha=0.2, color='red', rasterized=True)
     ax.set_title('Training Intensity Factor')
     ax.set_ylabel('Intensity Factor')
     ax.tick_params(axis='x', rotation=45)
@@ -243,7 +316,7 @@ def create_activity_dashboard(activity_df, activity_baselines):
     ax.axhline(y=activity_baselines['caloric_efficiency']['good'], color='orange', linestyle='--', alpha=0.7)
     ax.axhline(y=activity_baselines['caloric_efficiency']['poor'], color='red', linestyle='--', alpha=0.7)
     ax.fill_between(activity_df['date'], activity_baselines['caloric_efficiency']['poor'], 
-                    activity_baselines['caloric_efficiency']['good'], alpha=0.2, color='green')
+                    activity_baselines['caloric_efficiency']['good'], alpha=0.2, color='green', rasterized=True)
     ax.set_title('Caloric Efficiency')
     ax.set_ylabel('Distance/Calories (m/cal)')
     ax.tick_params(axis='x', rotation=45)
@@ -256,7 +329,6 @@ def create_activity_dashboard(activity_df, activity_baselines):
     
     # 6. Weekly volume and intensity
     ax = axes[1, 2]
-    activity_df['week'] = activity_df['date'].dt.isocalendar().week
     weekly_volume = activity_df.groupby('week')['distance_km'].sum()
     weekly_intensity = activity_df.groupby('week')['intensity_factor'].mean()
     
@@ -274,7 +346,6 @@ def create_activity_dashboard(activity_df, activity_baselines):
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
-    plt.tight_layout()
     return fig
 
 # Generate the dashboards
@@ -0,0 +1,97 @@
+"""Vectorized health metric formulas.
+
+Each function maps to a formula documented in assets/usefulCalculators.py
+and accepts scalars, NumPy arrays, or pandas Series. Everything is a plain
+arithmetic expression, so passing whole columns computes the metric for
+every row in one vector op with no Python-level iteration.
+"""
+
+import numpy as np
+
+
+# --- Daily summary metrics ---
+
+def activity_score(steps, active_minutes):
+    """Activity Score = (Steps / 10,000) x 0.4 + (Active Minutes / 60) x 0.6"""
+    return (steps / 10000) * 0.4 + (active_minutes / 60) * 0.6
+
+
+def movement_ratio(active_minutes):
+    """Movement Ratio = Active Time / (24 x 60) x 100"""
+    return active_minutes / (24 * 60) * 100
+
+
+def caloric_efficiency(distance_km, calories_burned):
+    """Caloric Efficiency = Distance / Calories Burned (m/cal)"""
+    return distance_km / calories_burned * 1000
+
+
+# --- Sleep metrics ---
+
+def sleep_efficiency(total_sleep_minutes, time_in_bed_minutes):
+    """Sleep Efficiency = (Total Sleep Time / Time in Bed) x 100"""
+    return total_sleep_minutes / time_in_bed_minutes * 100
+
+
+def deep_sleep_pct(deep_sleep_minutes, total_sleep_minutes):
+    """Deep Sleep % = (Deep Sleep Duration / Total Sleep Time) x 100"""
+    return deep_sleep_minutes / total_sleep_minutes * 100
+
+
+def sleep_debt(target_sleep_hours, actual_sleep_hours):
+    """Sleep Debt = Target Sleep Hours - Actual Sleep Hours"""
+    return target_sleep_hours - actual_sleep_hours
+
+
+# --- Heart rate variability metrics ---
+
+def hrv_recovery_score(current_hrv, hrv_7day_avg):
+    """HRV Recovery Score = (Current HRV / 7-Day HRV Average) x 100"""
+    return current_hrv / hrv_7day_avg * 100
+
+
+def hrv_trend(today_hrv, yesterday_hrv):
+    """HRV Trend = (Today's HRV - Yesterday's HRV) / Yesterday's HRV x 100"""
+    return (today_hrv - yesterday_hrv) / yesterday_hrv * 100
+
+
+# --- Body composition metrics ---
+
+def bmi(weight_kg, height_m):
+    """BMI = Weight (kg) / (Height (m))^2"""
+    return weight_kg / np.square(height_m)
+
+
+def lean_body_mass(weight_kg, body_fat_pct):
+    """Lean Mass = Weight x (1 - Body Fat Percentage)"""
+    return weight_kg * (1 - body_fat_pct / 100)
+
+
+# --- Activity metrics ---
+
+def intensity_factor(avg_hr, threshold_hr=170):
+    """Intensity Factor = Average Heart Rate / Threshold Heart Rate"""
+    return avg_hr / threshold_hr
+
+
+def pace_consistency(pace_std, avg_pace):
+    """Pace Consistency = 1 - (Pace Standard Deviation / Average Pace)"""
+    return 1 - pace_std / avg_pace
+
+
+def elevation_efficiency(elevation_gain, distance_km):
+    """Elevation Efficiency = Total Ascent / Total Distance"""
+    return elevation_gain / distance_km
+
+
+# --- Composite scores ---
+
+def recovery_score(hrv_score, sleep_efficiency_pct, resting_hr):
+    """Recovery = (HRV x 0.4) + (Sleep Efficiency x 0.3) + (Resting HR x 0.3)"""
+    return hrv_score * 0.4 + sleep_efficiency_pct * 0.3 + (100 - resting_hr) * 0.3
+
+
+def wellness_score(sleep_efficiency_pct, hrv_score, activity, stress_avg):
+    """Wellness = Sleep x 0.3 + HRV x 0.2 + Activity x 0.3 + Stress Mgmt x 0.2"""
+    return (sleep_efficiency_pct * 0.3 + hrv_score * 0.2 +
+            activity * 30 + (100 - stress_avg) * 0.2)
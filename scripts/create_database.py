@@ -1,10 +1,56 @@
 import sqlite3
 import os
+import threading
 from datetime import datetime, timedelta
-import random
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Metric kind codes for the compiled generator kernel
+KIND_NORMAL = 0
+KIND_STEPS = 1
+KIND_BODY_BATTERY = 2
+
+if HAS_NUMBA:
+    @njit(cache=True, parallel=True)
+    def _gen_metric_values(kinds, mins, maxs, hours, seed):
+        """Produce the (n_metrics, n_points) sample matrix in machine code"""
+        n_metrics = kinds.shape[0]
+        n_points = hours.shape[0]
+        out = np.empty((n_metrics, n_points))
+        np.random.seed(seed)
+
+        for m in prange(n_metrics):
+            if kinds[m] == KIND_STEPS:
+                # Steps accumulate throughout the day
+                for i in range(n_points):
+                    value = hours[i] * 400 + np.random.randint(0, 201)
+                    out[m, i] = value if value < 15000 else 15000
+            elif kinds[m] == KIND_BODY_BATTERY:
+                # Body battery pattern: high in morning, depletes during day
+                for i in range(n_points):
+                    value = 100 - hours[i] * 3 + np.random.randint(-10, 11)
+                    if value < 20:
+                        value = 20
+                    out[m, i] = value if value < 100 else 100
+            else:
+                mid = (mins[m] + maxs[m]) / 2
+                std = (maxs[m] - mins[m]) / 6
+                for i in range(n_points):
+                    value = np.random.normal(mid, std)
+                    if value < mins[m]:
+                        value = mins[m]
+                    elif value > maxs[m]:
+                        value = maxs[m]
+                    out[m, i] = value
+
+        return out
+
 class HealthMetricsDB:
     def __init__(self, db_path='C:/smakrykoDBs/health_metrics.db'):
         """Initialize database connection and create directory if needed"""
@@ -12,17 +58,53 @@ class HealthMetricsDB:
         os.makedirs(os.path.dirname(db_path) if os.path.dirname(db_path) else '.', exist_ok=True)
         
         self.db_path = db_path
-        self.connection = sqlite3.connect(db_path)
+        # Larger statement cache keeps the bulk-load SQL prepared across calls.
+        # check_same_thread=False lets Streamlit workers share the connection;
+        # writes are serialized through self._write_lock.
+        self.connection = sqlite3.connect(db_path, cached_statements=256,
+                                          check_same_thread=False)
         self.cursor = self.connection.cursor()
+        self._write_lock = threading.Lock()
+
+        # One seeded PCG64 generator for all sample data: reproducible runs
+        # and fast bulk draws instead of mixing random and np.random
+        self.rng = np.random.default_rng(42)
         
         # Enable foreign keys
         self.cursor.execute("PRAGMA foreign_keys = ON")
-        
+
+        # WAL lets the read-heavy dashboard query while ingest writes in
+        # bursts; the mmap and page-cache settings serve repeat reads from
+        # mapped pages instead of read() syscalls
+        self.cursor.execute("PRAGMA journal_mode = WAL")
+        self.cursor.execute("PRAGMA synchronous = NORMAL")
+        self.cursor.execute("PRAGMA temp_store = MEMORY")
+        self.cursor.execute("PRAGMA mmap_size = 268435456")   # 256MB
+        self.cursor.execute("PRAGMA cache_size = -65536")     # 64MB page cache
+        self.cursor.execute("PRAGMA busy_timeout = 5000")
+
+        # Metric bounds cached once per connection; hot paths read the dict
+        # instead of re-running the SELECT against metric_definitions
+        self._metric_bounds = self._load_metric_bounds()
+
+    def _load_metric_bounds(self):
+        """Read metric_definitions into {name: (range_min, range_max)}"""
+        try:
+            self.cursor.execute(
+                "SELECT metric_name, normal_range_min, normal_range_max FROM metric_definitions"
+            )
+        except sqlite3.OperationalError:
+            # Fresh database: the table is created later by create_tables
+            return {}
+        return {name: (lo, hi) for name, lo, hi in self.cursor.fetchall()}
+
     def create_tables(self):
         """Create all necessary tables for health metrics storage"""
-        
-        # Main health data table - normalized structure
-        self.cursor.execute('''
+
+        # One executescript call prepares the whole schema in a single
+        # implicit transaction instead of a round-trip per statement
+        self.cursor.executescript('''
+        -- Main health data table - normalized structure
         CREATE TABLE IF NOT EXISTS health_data (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp DATETIME NOT NULL,
@@ -32,10 +114,9 @@ class HealthMetricsDB:
             sync_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             UNIQUE(timestamp, metric_name)
-        )''')
-        
-        # User profiles and personal baselines
-        self.cursor.execute('''
+        );
+
+        -- User profiles and personal baselines
         CREATE TABLE IF NOT EXISTS user_profiles (
             user_id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT UNIQUE NOT NULL,
@@ -46,10 +127,9 @@ class HealthMetricsDB:
             activity_level TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )''')
-        
-        # Personal baselines for each metric
-        self.cursor.execute('''
+        );
+
+        -- Personal baselines for each metric
         CREATE TABLE IF NOT EXISTS personal_baselines (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER,
@@ -61,10 +141,9 @@ class HealthMetricsDB:
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES user_profiles (user_id),
             UNIQUE(user_id, metric_name)
-        )''')
-        
-        # Activity sessions (for workout/exercise data)
-        self.cursor.execute('''
+        );
+
+        -- Activity sessions (for workout/exercise data)
         CREATE TABLE IF NOT EXISTS activity_sessions (
             session_id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER,
@@ -81,10 +160,9 @@ class HealthMetricsDB:
             device_id TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES user_profiles (user_id)
-        )''')
-        
-        # Sleep sessions (detailed sleep tracking)
-        self.cursor.execute('''
+        );
+
+        -- Sleep sessions (detailed sleep tracking)
         CREATE TABLE IF NOT EXISTS sleep_sessions (
             sleep_id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER,
@@ -104,10 +182,9 @@ class HealthMetricsDB:
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES user_profiles (user_id),
             UNIQUE(user_id, sleep_date)
-        )''')
-        
-        # Alert/notification logs
-        self.cursor.execute('''
+        );
+
+        -- Alert/notification logs
         CREATE TABLE IF NOT EXISTS health_alerts (
             alert_id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER,
@@ -121,10 +198,9 @@ class HealthMetricsDB:
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             acknowledged_at DATETIME,
             FOREIGN KEY (user_id) REFERENCES user_profiles (user_id)
-        )''')
-        
-        # Metric definitions and metadata
-        self.cursor.execute('''
+        );
+
+        -- Metric definitions and metadata
         CREATE TABLE IF NOT EXISTS metric_definitions (
             metric_name TEXT PRIMARY KEY,
             display_name TEXT NOT NULL,
@@ -135,28 +211,33 @@ class HealthMetricsDB:
             normal_range_max REAL,
             description TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )''')
-        
+        );
+        ''')
+
         print("✅ All tables created successfully!")
-    
+
     def create_indexes(self):
         """Create indexes for better query performance"""
-        
-        indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_health_data_timestamp ON health_data(timestamp)",
-            "CREATE INDEX IF NOT EXISTS idx_health_data_metric ON health_data(metric_name)",
-            "CREATE INDEX IF NOT EXISTS idx_health_data_timestamp_metric ON health_data(timestamp, metric_name)",
-            "CREATE INDEX IF NOT EXISTS idx_activity_sessions_start_time ON activity_sessions(start_time)",
-            "CREATE INDEX IF NOT EXISTS idx_activity_sessions_user ON activity_sessions(user_id)",
-            "CREATE INDEX IF NOT EXISTS idx_sleep_sessions_date ON sleep_sessions(sleep_date)",
-            "CREATE INDEX IF NOT EXISTS idx_sleep_sessions_user ON sleep_sessions(user_id)",
-            "CREATE INDEX IF NOT EXISTS idx_health_alerts_created ON health_alerts(created_at)",
-            "CREATE INDEX IF NOT EXISTS idx_health_alerts_user ON health_alerts(user_id)"
-        ]
-        
-        for index_sql in indexes:
-            self.cursor.execute(index_sql)
-        
+
+        self.cursor.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_health_data_timestamp ON health_data(timestamp);
+        -- Lead with metric_name so 'WHERE metric_name=? AND timestamp>=?'
+        -- queries get a tight range scan; the covering variant also
+        -- includes metric_value so they never touch the table rows
+        CREATE INDEX IF NOT EXISTS idx_health_data_metric_ts ON health_data(metric_name, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_health_data_metric_ts_val ON health_data(metric_name, timestamp, metric_value);
+        CREATE INDEX IF NOT EXISTS idx_activity_sessions_start_time ON activity_sessions(start_time);
+        CREATE INDEX IF NOT EXISTS idx_activity_sessions_user ON activity_sessions(user_id);
+        CREATE INDEX IF NOT EXISTS idx_sleep_sessions_date ON sleep_sessions(sleep_date);
+        CREATE INDEX IF NOT EXISTS idx_sleep_sessions_user ON sleep_sessions(user_id);
+        CREATE INDEX IF NOT EXISTS idx_health_alerts_created ON health_alerts(created_at);
+        CREATE INDEX IF NOT EXISTS idx_health_alerts_user ON health_alerts(user_id);
+
+        -- Refresh planner statistics so SQLite actually prefers the
+        -- composite indexes over a table scan
+        ANALYZE;
+        """)
+
         print("✅ Database indexes created successfully!")
     
     def insert_metric_definitions(self):
@@ -179,130 +260,231 @@ class HealthMetricsDB:
             ('hydration_level', 'Hydration', 'score', 'wellness', 'integer', 0, 100, 'Hydration level score')
         ]
         
+        # Upsert instead of OR REPLACE: a conflicting row is updated in place
+        # rather than deleted and reinserted, so no PK churn, no DELETE
+        # triggers, and less journal traffic per row
         self.cursor.executemany('''
-        INSERT OR REPLACE INTO metric_definitions 
+        INSERT INTO metric_definitions
         (metric_name, display_name, unit, category, data_type, normal_range_min, normal_range_max, description)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(metric_name) DO UPDATE SET
+            display_name = excluded.display_name,
+            unit = excluded.unit,
+            category = excluded.category,
+            data_type = excluded.data_type,
+            normal_range_min = excluded.normal_range_min,
+            normal_range_max = excluded.normal_range_max,
+            description = excluded.description
         ''', metrics)
-        
+
+        # Definitions changed, so refresh the cached bounds
+        self._metric_bounds = self._load_metric_bounds()
+
         print("✅ Metric definitions inserted successfully!")
     
     def create_default_user(self):
         """Create a default user profile for testing"""
         
-        try:
-            self.cursor.execute('''
-            INSERT INTO user_profiles (username, age, gender, height_cm, weight_kg, activity_level)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', ('default_user', 30, 'unspecified', 170.0, 70.0, 'moderate'))
-            
-            user_id = self.cursor.lastrowid
-            
-            # Insert default baselines for the user
-            default_baselines = [
-                ('heart_rate', 65, 50, 80),
-                ('steps', 10000, 8000, 12000),
-                ('sleep_efficiency', 85, 75, 95),
-                ('hrv_score', 40, 25, 60),
-                ('stress_level', 25, 10, 40),
-                ('spo2', 98, 95, 100),
-                ('calories', 2200, 1500, 3000),
-                ('active_minutes', 60, 30, 90),
-                ('body_battery', 75, 50, 100),
-                ('respiration_rate', 16, 12, 20)
-            ]
-            
-            for metric, target, min_val, max_val in default_baselines:
-                self.cursor.execute('''
-                INSERT INTO personal_baselines (user_id, metric_name, target_value, min_threshold, max_threshold)
-                VALUES (?, ?, ?, ?, ?)
-                ''', (user_id, metric, target, min_val, max_val))
-            
-            print(f"✅ Default user created with ID: {user_id}")
-            return user_id
-            
-        except sqlite3.IntegrityError:
-            print("ℹ️ Default user already exists")
-            self.cursor.execute("SELECT user_id FROM user_profiles WHERE username = 'default_user'")
-            return self.cursor.fetchone()[0]
+        # INSERT OR IGNORE keeps "user already exists" out of exception
+        # control flow; the SELECT afterwards covers both the fresh-insert
+        # and already-present cases
+        self.cursor.execute('''
+        INSERT OR IGNORE INTO user_profiles (username, age, gender, height_cm, weight_kg, activity_level)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', ('default_user', 30, 'unspecified', 170.0, 70.0, 'moderate'))
+
+        self.cursor.execute("SELECT user_id FROM user_profiles WHERE username = 'default_user'")
+        user_id = self.cursor.fetchone()[0]
+
+        # Insert default baselines for the user in one batch
+        default_baselines = [
+            ('heart_rate', 65, 50, 80),
+            ('steps', 10000, 8000, 12000),
+            ('sleep_efficiency', 85, 75, 95),
+            ('hrv_score', 40, 25, 60),
+            ('stress_level', 25, 10, 40),
+            ('spo2', 98, 95, 100),
+            ('calories', 2200, 1500, 3000),
+            ('active_minutes', 60, 30, 90),
+            ('body_battery', 75, 50, 100),
+            ('respiration_rate', 16, 12, 20)
+        ]
+
+        self.cursor.executemany('''
+        INSERT OR IGNORE INTO personal_baselines (user_id, metric_name, target_value, min_threshold, max_threshold)
+        VALUES (?, ?, ?, ?, ?)
+        ''', [(user_id, m, t, lo, hi) for m, t, lo, hi in default_baselines])
+
+        print(f"✅ Default user created with ID: {user_id}")
+        return user_id
     
     def generate_sample_data(self, days=30, user_id=1):
         """Generate sample health data for testing"""
         
         print(f"🔄 Generating {days} days of sample data...")
         
-        # Get metric definitions
-        self.cursor.execute("SELECT metric_name, normal_range_min, normal_range_max FROM metric_definitions")
-        metrics = self.cursor.fetchall()
-        
+        # Metric bounds come from the per-connection cache as parallel arrays
+        # (names plus typed min/max vectors) so the ranges broadcast straight
+        # into the 2D draw below
+        names = list(self._metric_bounds)
+        mins = np.array([self._metric_bounds[n][0] for n in names], dtype=np.float64)
+        maxs = np.array([self._metric_bounds[n][1] for n in names], dtype=np.float64)
+
         # Generate data for each day
         start_date = datetime.now() - timedelta(days=days)
-        
-        for day in range(days):
-            current_date = start_date + timedelta(days=day)
-            
-            # Generate hourly data points (24 per day)
-            for hour in range(24):
-                timestamp = current_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-                
-                for metric_name, min_val, max_val in metrics:
-                    # Generate realistic values within normal ranges
-                    if metric_name == 'steps':
-                        # Steps accumulate throughout the day
-                        base_steps = hour * 400 + random.randint(0, 200)
-                        value = min(base_steps, 15000)
-                    elif metric_name == 'body_battery':
-                        # Body battery pattern: high in morning, depletes during day
-                        base_battery = max(20, 100 - (hour * 3) + random.randint(-10, 10))
-                        value = min(100, max(0, base_battery))
-                    elif metric_name == 'sleep_efficiency' and 6 <= hour <= 22:
-                        # Only generate sleep efficiency during typical sleep hours
-                        continue
-                    else:
-                        # Normal distribution around the middle of normal range
-                        mid_point = (min_val + max_val) / 2
-                        std_dev = (max_val - min_val) / 6  # 99.7% within range
-                        value = max(min_val, min(max_val, np.random.normal(mid_point, std_dev)))
-                    
-                    # Insert the data point
-                    try:
-                        self.cursor.execute('''
-                        INSERT OR REPLACE INTO health_data (timestamp, metric_name, metric_value, device_id)
-                        VALUES (?, ?, ?, ?)
-                        ''', (timestamp, metric_name, round(value, 2), 'simulator'))
-                    except Exception as e:
-                        print(f"Error inserting {metric_name} at {timestamp}: {e}")
-        
-        # Generate some sample sleep sessions
-        for day in range(days):
-            sleep_date = (start_date + timedelta(days=day)).date()
-            bedtime = datetime.combine(sleep_date, datetime.min.time().replace(hour=22, minute=30))
-            sleep_start = bedtime + timedelta(minutes=random.randint(10, 60))
-            sleep_end = sleep_start + timedelta(hours=random.randint(6, 9), minutes=random.randint(0, 59))
-            wake_time = sleep_end + timedelta(minutes=random.randint(5, 30))
-            
-            total_sleep = int((sleep_end - sleep_start).total_seconds() / 60)
-            deep_sleep = int(total_sleep * random.uniform(0.15, 0.25))
-            rem_sleep = int(total_sleep * random.uniform(0.20, 0.30))
-            light_sleep = total_sleep - deep_sleep - rem_sleep
-            awake_minutes = int((wake_time - bedtime).total_seconds() / 60) - total_sleep
-            
-            efficiency = (total_sleep / ((wake_time - bedtime).total_seconds() / 60)) * 100
-            
+        n_points = days * 24
+
+        # Hourly timestamps for the whole period as one contiguous
+        # DatetimeIndex, converted to ISO strings in a single strftime pass;
+        # the hour-of-day vector broadcasts across days so each metric is one
+        # vectorized draw instead of days*24 scalar RNG calls
+        base_time = start_date.replace(minute=0, second=0, microsecond=0)
+        ts = pd.date_range(base_time, periods=n_points, freq='h')
+        ts_str = ts.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+        # Taken from the grid itself rather than tiling 0..23: base_time
+        # keeps the current wall-clock hour, so the grid does not start at
+        # midnight and a tiled pattern would shift every daily curve
+        hours = ts.hour.to_numpy()
+
+        if HAS_NUMBA:
+            # Compiled kernel fills the whole sample matrix without any
+            # Python-level dispatch; kinds flag the special-case metrics
+            kinds = np.zeros(len(names), dtype=np.int8)
+            if 'steps' in names:
+                kinds[names.index('steps')] = KIND_STEPS
+            if 'body_battery' in names:
+                kinds[names.index('body_battery')] = KIND_BODY_BATTERY
+            all_values = _gen_metric_values(kinds, mins, maxs, hours, 42)
+        else:
+            # One broadcasted (n_metrics, n_points) draw covers every "normal"
+            # metric: normal distribution around the middle of each range with
+            # 99.7% of samples inside it
+            mid = (mins + maxs) / 2
+            std = (maxs - mins) / 6
+            all_values = np.clip(
+                self.rng.normal(mid[:, None], std[:, None], size=(len(names), n_points)),
+                mins[:, None], maxs[:, None]
+            )
+
+            # Special-case metrics overwrite their row of the 2D array
+            if 'steps' in names:
+                # Steps accumulate throughout the day
+                base_steps = hours * 400 + self.rng.integers(0, 201, size=n_points)
+                all_values[names.index('steps')] = np.minimum(base_steps, 15000)
+            if 'body_battery' in names:
+                # Body battery pattern: high in morning, depletes during day
+                base_battery = np.maximum(20, 100 - hours * 3 + self.rng.integers(-10, 11, size=n_points))
+                all_values[names.index('body_battery')] = np.clip(base_battery, 0, 100)
+
+        all_values = np.round(all_values, 2)
+
+        # Sleep efficiency only exists during typical sleep hours; pick those
+        # rows with one precomputed mask instead of branching every iteration
+        night_indices = np.flatnonzero((hours < 6) | (hours > 22))
+
+        # Accumulate rows and insert them in one batch so SQLite pays the
+        # statement-dispatch and commit cost once instead of once per row.
+        # The list is preallocated at full capacity and index-assigned, so
+        # no append-growth reallocations happen in the hot loop; positional
+        # tuples are what sqlite3's C binding handles fastest
+        health_rows = [None] * (len(names) * n_points)
+        idx = 0
+
+        for m, metric_name in enumerate(names):
+            values = all_values[m]
+            indices = night_indices if metric_name == 'sleep_efficiency' else range(n_points)
+            for i in indices:
+                health_rows[idx] = (ts_str[i], metric_name, float(values[i]), 'simulator')
+                idx += 1
+
+        # Daytime sleep-efficiency rows were skipped, so trim to what we filled
+        del health_rows[idx:]
+
+        # Generate some sample sleep sessions, computing every day's session
+        # with array arithmetic instead of per-day datetime construction
+        dates = pd.date_range(start_date.date(), periods=days, freq='D')
+        bedtime = dates + pd.Timedelta(hours=22, minutes=30)
+        sleep_start = bedtime + pd.to_timedelta(self.rng.integers(10, 61, days), unit='m')
+        duration = self.rng.integers(6, 10, days) * 60 + self.rng.integers(0, 60, days)
+        sleep_end = sleep_start + pd.to_timedelta(duration, unit='m')
+        wake_time = sleep_end + pd.to_timedelta(self.rng.integers(5, 31, days), unit='m')
+
+        total_sleep = ((sleep_end - sleep_start).total_seconds() / 60).astype(int)
+        deep_sleep = (total_sleep * self.rng.uniform(0.15, 0.25, days)).astype(int)
+        rem_sleep = (total_sleep * self.rng.uniform(0.20, 0.30, days)).astype(int)
+        light_sleep = total_sleep - deep_sleep - rem_sleep
+        time_in_bed = ((wake_time - bedtime).total_seconds() / 60).astype(int)
+        awake_minutes = time_in_bed - total_sleep
+        efficiency = np.round(total_sleep / time_in_bed * 100, 1)
+        sleep_scores = self.rng.integers(60, 96, days)
+
+        sleep_rows = list(zip(
+            [user_id] * days, dates.date,
+            bedtime.to_pydatetime(), sleep_start.to_pydatetime(),
+            sleep_end.to_pydatetime(), wake_time.to_pydatetime(),
+            total_sleep.tolist(), deep_sleep.tolist(), light_sleep.tolist(),
+            rem_sleep.tolist(), awake_minutes.tolist(), efficiency.tolist(),
+            sleep_scores.tolist(), ['simulator'] * days
+        ))
+
+        # Flush both batches inside a single explicit transaction. Health rows
+        # go through an unconstrained temp staging table first, so the
+        # UNIQUE(timestamp, metric_name) index is reconciled by one set-based
+        # INSERT OR IGNORE instead of a delete-and-reinsert probe per row.
+        # A single try/except covers the whole batch: any failure rolls the
+        # transaction back, rather than paying an exception frame per row.
+        with self._write_lock:
+            self.connection.commit()  # close any implicit transaction left open
             try:
+                self.connection.execute("BEGIN")
                 self.cursor.execute('''
-                INSERT OR REPLACE INTO sleep_sessions 
-                (user_id, sleep_date, bedtime, sleep_start, sleep_end, wake_time, 
-                 total_sleep_minutes, deep_sleep_minutes, light_sleep_minutes, 
-                 rem_sleep_minutes, awake_minutes, sleep_efficiency_percent, 
+                CREATE TEMP TABLE health_data_stage (
+                    timestamp DATETIME,
+                    metric_name TEXT,
+                    metric_value REAL,
+                    device_id TEXT
+                )''')
+                self.cursor.executemany('''
+                INSERT INTO health_data_stage (timestamp, metric_name, metric_value, device_id)
+                VALUES (?, ?, ?, ?)
+                ''', health_rows)
+                # WHERE true disambiguates the upsert clause from a join for
+                # the INSERT ... SELECT form
+                self.cursor.execute('''
+                INSERT INTO health_data (timestamp, metric_name, metric_value, device_id)
+                SELECT timestamp, metric_name, metric_value, device_id FROM health_data_stage
+                WHERE true
+                ON CONFLICT(timestamp, metric_name) DO UPDATE SET
+                    metric_value = excluded.metric_value,
+                    sync_timestamp = CURRENT_TIMESTAMP
+                ''')
+                self.cursor.execute("DROP TABLE health_data_stage")
+                self.cursor.executemany('''
+                INSERT INTO sleep_sessions
+                (user_id, sleep_date, bedtime, sleep_start, sleep_end, wake_time,
+                 total_sleep_minutes, deep_sleep_minutes, light_sleep_minutes,
+                 rem_sleep_minutes, awake_minutes, sleep_efficiency_percent,
                  sleep_score, device_id)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (user_id, sleep_date, bedtime, sleep_start, sleep_end, wake_time,
-                      total_sleep, deep_sleep, light_sleep, rem_sleep, awake_minutes,
-                      round(efficiency, 1), random.randint(60, 95), 'simulator'))
-            except Exception as e:
-                print(f"Error inserting sleep data for {sleep_date}: {e}")
-        
+                ON CONFLICT(user_id, sleep_date) DO UPDATE SET
+                    bedtime = excluded.bedtime,
+                    sleep_start = excluded.sleep_start,
+                    sleep_end = excluded.sleep_end,
+                    wake_time = excluded.wake_time,
+                    total_sleep_minutes = excluded.total_sleep_minutes,
+                    deep_sleep_minutes = excluded.deep_sleep_minutes,
+                    light_sleep_minutes = excluded.light_sleep_minutes,
+                    rem_sleep_minutes = excluded.rem_sleep_minutes,
+                    awake_minutes = excluded.awake_minutes,
+                    sleep_efficiency_percent = excluded.sleep_efficiency_percent,
+                    sleep_score = excluded.sleep_score,
+                    device_id = excluded.device_id
+                ''', sleep_rows)
+                self.connection.commit()
+            except sqlite3.Error:
+                self.connection.rollback()
+                raise
+
         print("✅ Sample data generation completed!")
     
     def commit_and_close(self):
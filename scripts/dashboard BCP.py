@@ -4,13 +4,234 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 import json
+import zlib
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Metric kind codes for the compiled synthesis kernel
+_KIND_OTHER = 0
+_KIND_HEART_RATE = 1
+_KIND_STEPS = 2
+_KIND_SLEEP = 3
+_KIND_BODY_BATTERY = 4
+
+_METRIC_KINDS = {
+    'heart_rate': _KIND_HEART_RATE,
+    'steps': _KIND_STEPS,
+    'sleep_efficiency': _KIND_SLEEP,
+    'body_battery': _KIND_BODY_BATTERY
+}
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _synth(kind, target, hours_arr, rand, lo, hi):
+        """Fuse rhythm, accumulation, and clipping into one output pass.
+
+        The RNG draws stay outside (rand holds standard normals, or Poisson
+        counts for steps) so results match the NumPy fallback; the kernel
+        writes a single buffer instead of allocating a temporary per step.
+        """
+        n = rand.shape[0]
+        out = np.empty(n)
+        acc = 0.0
+        for i in range(n):
+            if kind == _KIND_HEART_RATE:
+                v = target + 8.0 * rand[i] + 10.0 * np.sin(2.0 * np.pi * hours_arr[i] / 24.0)
+            elif kind == _KIND_STEPS:
+                acc += rand[i]
+                v = acc
+            elif kind == _KIND_SLEEP:
+                v = target + 5.0 * rand[i]
+            elif kind == _KIND_BODY_BATTERY:
+                v = target + 30.0 * np.cos(2.0 * np.pi * (hours_arr[i] - 6.0) / 24.0) + 5.0 * rand[i]
+            else:
+                v = target + target * 0.15 * rand[i]
+            if v < lo:
+                v = lo
+            elif v > hi:
+                v = hi
+            out[i] = v
+        return out
+
+# Built once at import; get_color_palette used to rebuild this dict on
+# every chart render
+_COLOR_THEMES = {
+    'default': px.colors.qualitative.Set1,
+    'dark': px.colors.qualitative.Dark2,
+    'pastel': px.colors.qualitative.Pastel1,
+    'health': ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57'],
+    'clinical': ['#2C3E50', '#E74C3C', '#3498DB', '#2ECC71', '#F39C12']
+}
+
+@lru_cache(maxsize=8)
+def _hex_to_rgba(hex_color, alpha):
+    """Build the rgba() fill string once per (color, alpha) pair"""
+    return f"rgba{tuple(list(px.colors.hex_to_rgb(hex_color)) + [alpha])}"
+
+@lru_cache(maxsize=64)
+def _pretty(name):
+    """Display form of a metric name ('heart_rate' -> 'Heart Rate')"""
+    return name.replace('_', ' ').title()
+
+# Only about a pixel-column's worth of points is visually distinguishable;
+# anything above this is pure serialization and render cost
+MAX_PLOT_POINTS = 1500
+
+def _lttb(series, n_out=MAX_PLOT_POINTS):
+    """Downsample a series with largest-triangle-three-buckets.
+
+    Keeps the visually dominant points (peaks, troughs, slope changes), so
+    the reduced trace is indistinguishable from the full one at screen
+    resolution while the Plotly payload shrinks by len(series) / n_out.
+    """
+    n = len(series)
+    if n <= n_out:
+        return series
+
+    x = series.index.astype('int64').to_numpy().astype(np.float64)
+    y = series.to_numpy(dtype=np.float64)
+    # Bucket boundaries for the n_out - 2 interior buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket anchors the triangle's third vertex
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < n_out - 1 else n
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+        # Pick the bucket point forming the largest triangle with a and avg
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return series.iloc[keep]
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _generate_series(metric, hours, target, min_val, max_val):
+    """Build the demo series once per (metric, window, baseline) and serve
+    every consumer in a rerun from the cache; the adaptive layout and the
+    alert checks ask for the same metric and would otherwise each pay the
+    RNG and timestamp construction"""
+    # Regular 5-minute grid built straight from int64 nanoseconds;
+    # pd.date_range's offset arithmetic dominates construction time for
+    # the short windows and the grid needs none of it
+    step_ns = 5 * 60 * 1_000_000_000
+    n = hours * 12 + 1
+    now_ns = np.int64(datetime.now().timestamp() * 1e9)
+    timestamps = pd.DatetimeIndex(
+        (np.arange(n, dtype=np.int64) * step_ns
+         + (now_ns - (n - 1) * step_ns)).view('datetime64[ns]')
+    )
+
+    kind = _METRIC_KINDS.get(metric, _KIND_OTHER)
+
+    # Per-metric seeded PCG64 generator: faster draws than the legacy
+    # np.random global, and deterministic per metric so identical reruns
+    # produce identical series (which is what makes the caching sound)
+    rng = np.random.default_rng(zlib.crc32(metric.encode()))
+
+    if HAS_NUMBA:
+        hours_array = timestamps.hour.values.astype(np.float64)
+        rand = (rng.poisson(target / 24, len(timestamps)).astype(np.float64)
+                if kind == _KIND_STEPS else rng.standard_normal(len(timestamps)))
+        values = _synth(kind, float(target), hours_array, rand,
+                        float(min_val) * 0.8, float(max_val) * 1.2)
+        # float32 halves the per-tick Plotly payload with no visible loss
+        return pd.Series(values.astype(np.float32), index=timestamps)
+
+    # Add some realistic variation based on metric type
+    if metric == 'heart_rate':
+        values = rng.normal(target, 8, len(timestamps))
+        # Add some daily rhythm
+        hours_array = timestamps.hour.values
+        daily_variation = 10 * np.sin(2 * np.pi * hours_array / 24)
+        values += daily_variation
+    elif metric == 'steps':
+        # Steps accumulate throughout the day
+        hourly_steps = rng.poisson(target/24, len(timestamps))
+        values = np.cumsum(hourly_steps)
+    elif metric == 'sleep_efficiency':
+        # Sleep efficiency varies less
+        values = rng.normal(target, 5, len(timestamps))
+    elif metric == 'body_battery':
+        # Body battery depletes during day, recharges at night
+        hours_array = timestamps.hour.values
+        daily_pattern = 30 * np.cos(2 * np.pi * (hours_array - 6) / 24)
+        values = target + daily_pattern + rng.normal(0, 5, len(timestamps))
+    else:
+        values = rng.normal(target, target * 0.15, len(timestamps))
+
+    # Ensure values stay within reasonable bounds; float32 halves the
+    # per-tick Plotly payload with no visible loss
+    values = np.clip(values, min_val * 0.8, max_val * 1.2).astype(np.float32)
+
+    return pd.Series(values, index=timestamps)
+
+@st.cache_data(ttl=30, max_entries=64, show_spinner=False)
+def _figure_dict(metric_name, chart_type, theme, x, y, baseline_items):
+    """Build a figure and cache its serialized dict.
+
+    Figure assembly plus Plotly's JSON serialization is the dominant
+    Python cost of a tick; caching the dict keyed on the data arrays and
+    styling knobs skips both on unchanged reruns, and go.Figure(dict) on
+    the way out is cheap. baseline_items is the baseline dict as sorted
+    tuples so the key stays hashable.
+    """
+    data = pd.Series(y, index=pd.DatetimeIndex(x))
+    colors = _COLOR_THEMES.get(theme, _COLOR_THEMES['default'])
+    baseline = dict(baseline_items)
+    dash = RealTimeHealthDashboard
+    if chart_type == "gauge":
+        fig = dash.create_gauge_chart(metric_name, data, colors, baseline)
+    elif chart_type == "area":
+        fig = dash.create_area_chart(metric_name, data, colors, baseline)
+    elif chart_type == "bar":
+        fig = dash.create_bar_chart(metric_name, data, colors, baseline)
+    else:
+        fig = dash.create_line_chart(metric_name, data, colors, baseline)
+    return fig.to_dict()
+
+# Fallback bounds for metrics without a configured baseline
+_DEFAULT_BASELINE = pd.Series({'min': 0.0, 'target': 50.0, 'max': 100.0})
 
 class RealTimeHealthDashboard:
     def __init__(self):
         self.initialize_session_state()
         self.setup_page_config()
+        self._refresh_baseline_view()
+
+    def _refresh_baseline_view(self):
+        """Columnar float32 view of the baselines.
+
+        The dict-of-dicts in session state costs two hash lookups per
+        bound; this frame answers chart and alert code with one .loc per
+        metric and lines up directly with vectorized comparisons.
+        """
+        self.baseline_df = (
+            pd.DataFrame(st.session_state.personal_baselines).T
+            .reindex(columns=['min', 'target', 'max'])
+            .astype(np.float32)
+        )
+
+    def _bl(self, metric):
+        """Baseline row (min/target/max) for a metric, with defaults"""
+        if metric in self.baseline_df.index:
+            return self.baseline_df.loc[metric]
+        return _DEFAULT_BASELINE
     
     def initialize_session_state(self):
         """Initialize customization settings in session state"""
@@ -48,14 +269,7 @@ class RealTimeHealthDashboard:
 
     def get_color_palette(self, theme):
         """Get color palette based on theme selection"""
-        color_themes = {
-            'default': px.colors.qualitative.Set1,
-            'dark': px.colors.qualitative.Dark2,
-            'pastel': px.colors.qualitative.Pastel1,
-            'health': ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57'],
-            'clinical': ['#2C3E50', '#E74C3C', '#3498DB', '#2ECC71', '#F39C12']
-        }
-        return color_themes.get(theme, px.colors.qualitative.Set1)
+        return _COLOR_THEMES.get(theme, _COLOR_THEMES['default'])
 
     def create_customization_sidebar(self):
         """Create comprehensive customization sidebar"""
@@ -127,7 +341,7 @@ class RealTimeHealthDashboard:
         
         # Expandable sections for each metric
         for metric in st.session_state.metric_preferences['primary_metrics']:
-            with st.sidebar.expander(f"{metric.replace('_', ' ').title()} Settings"):
+            with st.sidebar.expander(f"{_pretty(metric)} Settings"):
                 if metric not in st.session_state.personal_baselines:
                     st.session_state.personal_baselines[metric] = {
                         'min': 0, 'max': 100, 'target': 50
@@ -153,7 +367,7 @@ class RealTimeHealthDashboard:
                 
                 # Target setting
                 target = st.slider(
-                    f"Target {metric.replace('_', ' ').title()}",
+                    f"Target {_pretty(metric)}",
                     min_value=config['min'],
                     max_value=config['max'],
                     value=baseline.get('target', config['default']),
@@ -187,21 +401,21 @@ class RealTimeHealthDashboard:
                     'target': target
                 }
 
+        # Re-derive the columnar view once after all edits
+        self._refresh_baseline_view()
+
     def create_real_time_chart(self, metric_name, data, chart_type, color_theme):
         """Generate customizable real-time charts"""
-        colors = self.get_color_palette(color_theme)
-        baseline = st.session_state.personal_baselines.get(metric_name, {})
-        
-        if chart_type == "gauge":
-            return self.create_gauge_chart(metric_name, data, colors, baseline)
-        elif chart_type == "area":
-            return self.create_area_chart(metric_name, data, colors, baseline)
-        elif chart_type == "bar":
-            return self.create_bar_chart(metric_name, data, colors, baseline)
-        else:
-            return self.create_line_chart(metric_name, data, colors, baseline)
+        baseline = self._bl(metric_name)
+        fig_dict = _figure_dict(
+            metric_name, chart_type, color_theme,
+            data.index.to_numpy(), data.to_numpy(),
+            tuple(baseline.items())
+        )
+        return go.Figure(fig_dict)
 
-    def create_gauge_chart(self, metric_name, data, colors, baseline):
+    @staticmethod
+    def create_gauge_chart(metric_name, data, colors, baseline):
         """Create customizable gauge chart for real-time metrics"""
         current_value = data.iloc[-1] if len(data) > 0 else 0
         target = baseline.get('target', 50)
@@ -215,7 +429,7 @@ class RealTimeHealthDashboard:
             mode = "gauge+number+delta",
             value = current_value,
             delta = {'reference': target, 'position': "top"},
-            title = {'text': f"{metric_name.replace('_', ' ').title()}"},
+            title = {'text': f"{_pretty(metric_name)}"},
             gauge = {
                 'axis': {'range': [None, gauge_max]},
                 'bar': {'color': colors[0]},
@@ -240,49 +454,70 @@ class RealTimeHealthDashboard:
         
         return fig
 
-    def create_line_chart(self, metric_name, data, colors, baseline):
+    @staticmethod
+    def create_line_chart(metric_name, data, colors, baseline):
         """Create customizable line chart with baseline zones"""
-        fig = go.Figure()
-        
-        # Add baseline zones
+        # Decide on WebGL from the raw length: after downsampling the series
+        # never exceeds MAX_PLOT_POINTS, so the check would never fire
+        use_gl = len(data) > 2000
+
+        # Downsample before plotting: the full 7d/30d series would be
+        # serialized and rendered point-for-point for no visual gain
+        data = _lttb(data)
+
+        pretty = _pretty(metric_name)
+
+        # Assemble the whole figure as one plain dict: add_trace/add_hrect/
+        # add_hline each walk Plotly's recursive property validator, which
+        # dominates build time for known-good values. The shapes/annotations
+        # carry the baseline zone and target line.
+        shapes = []
+        annotations = []
         if baseline:
-            fig.add_hrect(
-                y0=baseline.get('min', 0), 
-                y1=baseline.get('target', 50),
-                fillcolor="lightgreen", 
-                opacity=0.2,
-                line_width=0,
-                annotation_text="Good Zone"
-            )
-            
-            fig.add_hline(
-                y=baseline.get('target', 50),
-                line_dash="dash",
-                line_color=colors[0],
-                annotation_text="Target"
-            )
-        
-        # Add data line
-        fig.add_trace(go.Scatter(
-            x=data.index,
-            y=data.values,
-            mode='lines+markers',
-            name=metric_name.replace('_', ' ').title(),
-            line=dict(color=colors[0], width=3),
-            marker=dict(size=6)
-        ))
-        
-        fig.update_layout(
-            title=f"Real-Time {metric_name.replace('_', ' ').title()}",
-            xaxis_title="Time",
-            yaxis_title=metric_name.replace('_', ' ').title(),
-            height=400,
-            showlegend=True
-        )
-        
-        return fig
+            target = baseline.get('target', 50)
+            shapes = [
+                {'type': 'rect', 'xref': 'paper', 'x0': 0, 'x1': 1,
+                 'yref': 'y', 'y0': baseline.get('min', 0), 'y1': target,
+                 'fillcolor': 'lightgreen', 'opacity': 0.2, 'line': {'width': 0}},
+                {'type': 'line', 'xref': 'paper', 'x0': 0, 'x1': 1,
+                 'yref': 'y', 'y0': target, 'y1': target,
+                 'line': {'dash': 'dash', 'color': colors[0]}}
+            ]
+            annotations = [
+                {'xref': 'paper', 'x': 0, 'yref': 'y', 'y': target,
+                 'text': 'Good Zone', 'showarrow': False, 'yanchor': 'bottom'},
+                {'xref': 'paper', 'x': 1, 'yref': 'y', 'y': target,
+                 'text': 'Target', 'showarrow': False, 'yanchor': 'bottom'}
+            ]
+
+        # Long series render through WebGL instead of one SVG node per point
+        trace_type = 'scattergl' if use_gl else 'scatter'
 
-    def create_area_chart(self, metric_name, data, colors, baseline):
+        fig_dict = {
+            'data': [{
+                'type': trace_type,
+                'x': data.index,
+                'y': data.values,
+                'mode': 'lines+markers',
+                'name': pretty,
+                'line': {'color': colors[0], 'width': 3},
+                'marker': {'size': 6}
+            }],
+            'layout': {
+                'title': {'text': f"Real-Time {pretty}"},
+                'xaxis': {'title': {'text': 'Time'}},
+                'yaxis': {'title': {'text': pretty}},
+                'height': 400,
+                'showlegend': True,
+                'shapes': shapes,
+                'annotations': annotations
+            }
+        }
+
+        return go.Figure(fig_dict, skip_invalid=True)
+
+    @staticmethod
+    def create_area_chart(metric_name, data, colors, baseline):
         """Create area chart with baseline zones"""
         fig = go.Figure()
         
@@ -296,30 +531,39 @@ class RealTimeHealthDashboard:
                 line_width=0
             )
         
+        # Scattergl does not support tozeroy fills reliably, so long series
+        # are downsampled to stay under the SVG point budget instead
+        if len(data) > 2000:
+            rule = f"{max(1, int(len(data) / 2000) * 5)}min"
+            data = data.resample(rule).mean()
+
         # Add area chart
         fig.add_trace(go.Scatter(
             x=data.index,
             y=data.values,
             mode='lines',
             fill='tozeroy',
-            name=metric_name.replace('_', ' ').title(),
+            name=_pretty(metric_name),
             line=dict(color=colors[0], width=2),
-            fillcolor=f"rgba{tuple(list(px.colors.hex_to_rgb(colors[0])) + [0.3])}"
+            fillcolor=_hex_to_rgba(colors[0], 0.3)
         ))
         
         fig.update_layout(
-            title=f"Real-Time {metric_name.replace('_', ' ').title()}",
+            title=f"Real-Time {_pretty(metric_name)}",
             xaxis_title="Time",
-            yaxis_title=metric_name.replace('_', ' ').title(),
+            yaxis_title=_pretty(metric_name),
             height=400
         )
         
         return fig
 
-    def create_bar_chart(self, metric_name, data, colors, baseline):
+    @staticmethod
+    def create_bar_chart(metric_name, data, colors, baseline):
         """Create bar chart for discrete time periods"""
-        # Resample data to hourly for bar chart
-        hourly_data = data.resample('1H').mean()
+        # Hourly means via groupby on the floored index: only hours that
+        # actually contain samples become bins, unlike resample which
+        # materializes the full empty-bin grid across the span
+        hourly_data = data.groupby(data.index.floor('h')).mean()
         
         fig = go.Figure()
         
@@ -336,14 +580,14 @@ class RealTimeHealthDashboard:
         fig.add_trace(go.Bar(
             x=hourly_data.index,
             y=hourly_data.values,
-            name=metric_name.replace('_', ' ').title(),
+            name=_pretty(metric_name),
             marker_color=colors[0]
         ))
         
         fig.update_layout(
-            title=f"Hourly {metric_name.replace('_', ' ').title()}",
+            title=f"Hourly {_pretty(metric_name)}",
             xaxis_title="Time",
-            yaxis_title=metric_name.replace('_', ' ').title(),
+            yaxis_title=_pretty(metric_name),
             height=400
         )
         
@@ -383,95 +627,100 @@ class RealTimeHealthDashboard:
         else:
             cols = st.columns(3)
         
+        # Warm the per-metric series cache concurrently before rendering:
+        # the NumPy synthesis releases the GIL, so the fetch stage overlaps
+        # instead of running one metric after another. The render loop below
+        # then hits the cache. st.session_state only exists on the script
+        # thread, so resolve each metric's arguments here and hand the
+        # workers the plain module-level synthesis function.
+        if len(metrics) > 1:
+            series_args = [self._series_args(m) for m in metrics]
+            with ThreadPoolExecutor(max_workers=min(8, len(metrics))) as ex:
+                list(ex.map(lambda args: _generate_series(*args), series_args))
+
+        # Each metric renders inside its own fragment: the update timer (and
+        # any interaction scoped to the fragment) reruns just that block
+        # instead of the whole script
+        update_freq = st.session_state.metric_preferences['update_frequency']
+
+        @st.fragment(run_every=update_freq)
+        def _render_metric(metric):
+            # Generate sample real-time data
+            data = self.generate_real_time_data(metric)
+
+            # Create chart
+            fig = self.create_real_time_chart(
+                metric,
+                data,
+                chart_type,
+                st.session_state.metric_preferences['color_theme']
+            )
+
+            # A stable key lets the frontend update the existing plot in
+            # place (Plotly.react) instead of tearing down and remounting
+            # the whole SVG/WebGL scene on every tick
+            st.plotly_chart(fig, use_container_width=True, key=f"chart_{metric}")
+
+            # Add metric summary
+            current_value = data.iloc[-1] if len(data) > 0 else 0
+            target = self._bl(metric)['target']
+
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.metric("Current", f"{current_value:.1f}")
+            with col_b:
+                st.metric("Target", f"{target}")
+            with col_c:
+                # Calculate change from previous value
+                if len(data) > 1:
+                    change = ((current_value - data.iloc[-2]) / data.iloc[-2]) * 100
+                    st.metric("Change", f"{change:+.1f}%")
+                else:
+                    st.metric("Change", "N/A")
+
         # Generate charts for each metric
         for i, metric in enumerate(metrics):
             col_idx = i % len(cols)
-            
+
             with cols[col_idx]:
-                # Generate sample real-time data
-                data = self.generate_real_time_data(metric)
-                
-                # Create chart
-                fig = self.create_real_time_chart(
-                    metric, 
-                    data, 
-                    chart_type, 
-                    st.session_state.metric_preferences['color_theme']
-                )
-                
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Add metric summary
-                current_value = data.iloc[-1] if len(data) > 0 else 0
-                baseline = st.session_state.personal_baselines.get(metric, {})
-                target = baseline.get('target', 'N/A')
-                
-                col_a, col_b, col_c = st.columns(3)
-                with col_a:
-                    st.metric("Current", f"{current_value:.1f}")
-                with col_b:
-                    st.metric("Target", f"{target}")
-                with col_c:
-                    # Calculate change from previous value
-                    if len(data) > 1:
-                        change = ((current_value - data.iloc[-2]) / data.iloc[-2]) * 100
-                        st.metric("Change", f"{change:+.1f}%")
-                    else:
-                        st.metric("Change", "N/A")
+                _render_metric(metric)
 
-    def generate_real_time_data(self, metric):
-        """Generate sample real-time data for demonstration"""
+    def _series_args(self, metric):
+        """Resolve the _generate_series arguments from session state.
+
+        Must run on the script thread — worker threads have no
+        ScriptRunContext and cannot touch st.session_state.
+        """
         time_range = st.session_state.metric_preferences['time_range']
-        
+
         # Convert time range to hours
         hours = {
             '1h': 1, '6h': 6, '12h': 12, '24h': 24, '7d': 168, '30d': 720
         }[time_range]
-        
-        # Generate timestamps
-        now = datetime.now()
-        timestamps = pd.date_range(
-            start=now - timedelta(hours=hours),
-            end=now,
-            freq='5T'  # 5-minute intervals
-        )
-        
-        # Generate realistic data based on metric type
+
         baseline = st.session_state.personal_baselines.get(metric, {})
-        target = baseline.get('target', 50)
-        
-        # Add some realistic variation based on metric type
-        if metric == 'heart_rate':
-            values = np.random.normal(target, 8, len(timestamps))
-            # Add some daily rhythm
-            hours_array = np.array([t.hour for t in timestamps])
-            daily_variation = 10 * np.sin(2 * np.pi * hours_array / 24)
-            values += daily_variation
-        elif metric == 'steps':
-            # Steps accumulate throughout the day
-            hourly_steps = np.random.poisson(target/24, len(timestamps))
-            values = np.cumsum(hourly_steps)
-        elif metric == 'sleep_efficiency':
-            # Sleep efficiency varies less
-            values = np.random.normal(target, 5, len(timestamps))
-        elif metric == 'body_battery':
-            # Body battery depletes during day, recharges at night
-            hours_array = np.array([t.hour for t in timestamps])
-            daily_pattern = 30 * np.cos(2 * np.pi * (hours_array - 6) / 24)
-            values = target + daily_pattern + np.random.normal(0, 5, len(timestamps))
-        else:
-            values = np.random.normal(target, target * 0.15, len(timestamps))
-        
-        # Ensure values stay within reasonable bounds
-        min_val = baseline.get('min', 0) * 0.8
-        max_val = baseline.get('max', 100) * 1.2
-        values = np.clip(values, min_val, max_val)
-        
-        return pd.Series(values, index=timestamps)
+        return (metric, hours,
+                baseline.get('target', 50),
+                baseline.get('min', 0), baseline.get('max', 100))
+
+    def generate_real_time_data(self, metric):
+        """Generate sample real-time data for demonstration"""
+        return _generate_series(*self._series_args(metric))
 
     def create_alert_system(self):
         """Create customizable real-time alert system"""
-        
+
+        update_freq = st.session_state.metric_preferences['update_frequency']
+
+        @st.fragment(run_every=update_freq)
+        def _render_alerts():
+            self._render_alert_panel()
+
+        _render_alerts()
+
+    def _render_alert_panel(self):
+        """Alert panel body, rerun on its own fragment timer"""
+
         st.subheader("🚨 Real-Time Health Alerts")
         
         # Alert configuration
@@ -503,64 +752,67 @@ class RealTimeHealthDashboard:
         alerts = self.check_health_alerts(alert_types, sensitivity)
         
         with alert_container:
-            if alerts:
-                for alert in alerts:
-                    alert_color = "🔴" if alert['severity'] == 'high' else "🟡" if alert['severity'] == 'medium' else "🟢"
-                    
-                    if alert['severity'] == 'high':
-                        st.error(f"{alert_color} **{alert['metric']}**: {alert['message']} (Value: {alert['value']})")
-                    elif alert['severity'] == 'medium':
-                        st.warning(f"{alert_color} **{alert['metric']}**: {alert['message']} (Value: {alert['value']})")
-                    else:
-                        st.success(f"{alert_color} **{alert['metric']}**: {alert['message']} (Value: {alert['value']})")
+            if len(alerts):
+                # Severity resolves the widget and icon once per group; rows
+                # within a group render in bulk order
+                styles = {'high': (st.error, "🔴"), 'medium': (st.warning, "🟡"),
+                          'low': (st.success, "🟢")}
+                for severity, group in alerts.groupby('severity', sort=False):
+                    render, icon = styles[severity]
+                    for row in group.itertuples(index=False):
+                        render(f"{icon} **{row.metric}**: {row.message} (Value: {row.value})")
             else:
                 st.info("✅ All metrics are within normal ranges")
 
     def check_health_alerts(self, alert_types, sensitivity):
-        """Check for health metric alerts"""
-        alerts = []
+        """Check for health metric alerts, returned as a columnar DataFrame"""
+        # Parallel columns instead of a list of per-alert dicts: severity
+        # filtering and grouping downstream become vectorized operations
+        _metrics, _msgs, _vals, _sevs = [], [], [], []
         current_time = datetime.now()
-        
-        for metric in st.session_state.metric_preferences['primary_metrics']:
-            baseline = st.session_state.personal_baselines.get(metric, {})
-            
-            # Generate current value
-            data = self.generate_real_time_data(metric)
-            current_value = data.iloc[-1] if len(data) > 0 else baseline.get('target', 50)
-            
-            # Check threshold breaches
+
+        def emit(metric, message, value, severity):
+            _metrics.append(_pretty(metric))
+            _msgs.append(message)
+            _vals.append(round(value, 1))
+            _sevs.append(severity)
+
+        metrics = st.session_state.metric_preferences['primary_metrics']
+        if metrics:
+            # One columnar pass over all metrics: latest values and baseline
+            # bounds line up as Series, so the threshold and target checks
+            # are three vectorized comparisons instead of per-metric branching
+            baselines_df = self.baseline_df.reindex(metrics).fillna(_DEFAULT_BASELINE)
+
+            latest = pd.Series({
+                m: (lambda d: d.iloc[-1] if len(d) > 0 else baselines_df.at[m, 'target'])(
+                    self.generate_real_time_data(m))
+                for m in metrics
+            })
+
+            below = latest < baselines_df['min']
+            above = latest > baselines_df['max']
+            at_target = (latest - baselines_df['target']).abs() <= baselines_df['target'] * 0.05
+
             if "Threshold Breaches" in alert_types:
-                if current_value < baseline.get('min', 0):
-                    alerts.append({
-                        'metric': metric.replace('_', ' ').title(),
-                        'message': f"Below minimum threshold ({baseline.get('min', 0)})",
-                        'value': round(current_value, 1),
-                        'severity': 'high',
-                        'timestamp': current_time
-                    })
-                elif current_value > baseline.get('max', 100):
-                    alerts.append({
-                        'metric': metric.replace('_', ' ').title(),
-                        'message': f"Above maximum threshold ({baseline.get('max', 100)})",
-                        'value': round(current_value, 1),
-                        'severity': 'high',
-                        'timestamp': current_time
-                    })
-            
-            # Check target achievement
+                for m in latest.index[below]:
+                    emit(m, f"Below minimum threshold ({baselines_df.at[m, 'min']})",
+                         latest[m], 'high')
+                for m in latest.index[above]:
+                    emit(m, f"Above maximum threshold ({baselines_df.at[m, 'max']})",
+                         latest[m], 'high')
+
             if "Targets Reached" in alert_types:
-                target = baseline.get('target', 50)
-                tolerance = target * 0.05  # 5% tolerance
-                if abs(current_value - target) <= tolerance:
-                    alerts.append({
-                        'metric': metric.replace('_', ' ').title(),
-                        'message': f"Target achieved! 🎯",
-                        'value': round(current_value, 1),
-                        'severity': 'low',
-                        'timestamp': current_time
-                    })
-        
-        return alerts
+                for m in latest.index[at_target]:
+                    emit(m, "Target achieved! 🎯", latest[m], 'low')
+
+        return pd.DataFrame({
+            'metric': _metrics,
+            'message': _msgs,
+            'value': _vals,
+            'severity': _sevs,
+            'timestamp': current_time
+        })
 
     def create_custom_metric_builder(self):
         """Allow users to create custom composite health metrics"""
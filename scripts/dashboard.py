@@ -4,19 +4,120 @@ import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import sys
-import os
+from functools import lru_cache
 
-# Add the scripts directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
-from db_helper import HealthDataManager
+from scripts.db_helper import HealthDataManager
+
+def _rolling_mean(values, window):
+    """O(n) rolling mean via a differenced running sum.
+
+    Cheaper than pd.Series.rolling().mean() for the fixed windows the
+    charts use, and cost does not grow with the window size. Returns an
+    array of len(values) - window + 1 window means.
+    """
+    csum = np.cumsum(values, dtype=np.float64)
+    csum[window:] = csum[window:] - csum[:-window]
+    return csum[window - 1:] / window
+
+@lru_cache(maxsize=None)
+def _hours_for_range(time_range):
+    """Map a display period like '24h' to its lookback window in hours"""
+    return {'1h': 1, '6h': 6, '12h': 12, '24h': 24, '7d': 168, '30d': 720}[time_range]
+
+# Built once at import; get_color_palette used to rebuild this dict per chart
+_COLOR_THEMES = {
+    'default': tuple(px.colors.qualitative.Set1),
+    'dark': tuple(px.colors.qualitative.Dark2),
+    'pastel': tuple(px.colors.qualitative.Pastel1),
+    'health': ('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57'),
+    'clinical': ('#2C3E50', '#E74C3C', '#3498DB', '#2ECC71', '#F39C12')
+}
+
+@st.cache_data(ttl=30, max_entries=64, show_spinner=False)
+def _build_figure(metric_name, ts, values, chart_type, theme,
+                  target, min_val, max_val):
+    """Assemble a Plotly figure, cached on the data and styling knobs.
+
+    Streamlit reruns the whole script on any widget interaction; caching
+    here means the (comparatively expensive) figure assembly only repeats
+    when the series content, chart type, theme, or baseline changed. ts and
+    values are ndarrays so the cache key hashes their contents.
+    """
+    colors = _COLOR_THEMES.get(theme, _COLOR_THEMES['default'])
+    title = metric_name.replace('_', ' ').title()
+    data = pd.Series(values, index=ts)
+
+    if chart_type == "gauge":
+        clean = data.dropna()
+        current_value = clean.iloc[-1] if len(clean) > 0 else 0
+        target = target if target is not None else 50
+        min_val = min_val if min_val is not None else 0
+        max_val = max_val if max_val is not None else 100
+        gauge_max = max_val * 1.2
+        fig = go.Figure(go.Indicator(
+            mode="gauge+number+delta",
+            value=current_value,
+            delta={'reference': target, 'position': "top"},
+            title={'text': title},
+            gauge={
+                'axis': {'range': [None, gauge_max]},
+                'bar': {'color': colors[0]},
+                'steps': [
+                    {'range': [0, min_val], 'color': "lightcoral"},
+                    {'range': [min_val, target], 'color': "lightgreen"},
+                    {'range': [target, max_val], 'color': "gold"},
+                    {'range': [max_val, gauge_max], 'color': "lightcoral"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': target
+                }
+            }
+        ))
+        fig.update_layout(height=300)
+        return fig
+
+    else:  # default to line chart
+        fig = go.Figure()
+        if target is not None:
+            fig.add_hrect(y0=min_val if min_val is not None else 0, y1=target,
+                          fillcolor="lightgreen", opacity=0.2, line_width=0)
+            fig.add_hline(y=target, line_dash="dash",
+                          line_color=colors[0], annotation_text="Target")
+        fig.add_trace(go.Scatter(
+            x=data.index,
+            y=data.values,
+            mode='lines+markers',
+            name=title,
+            line=dict(color=colors[0], width=3),
+            marker=dict(size=6)
+        ))
+        # Trend overlay: rolling mean over ~a quarter of the window
+        clean = data.dropna()
+        window = max(2, len(clean) // 4)
+        if len(clean) > window:
+            fig.add_trace(go.Scatter(
+                x=clean.index[window - 1:],
+                y=_rolling_mean(clean.to_numpy(), window),
+                mode='lines',
+                name='Trend',
+                line=dict(color=colors[1 % len(colors)], width=1.5, dash='dot')
+            ))
+        fig.update_layout(
+            title=f"Real-Time {title}",
+            xaxis_title="Time",
+            yaxis_title=title,
+            height=400,
+            showlegend=False
+        )
+        return fig
 
 class RealTimeHealthDashboard:
     def __init__(self):
         self.db_manager = HealthDataManager()
         self.user_id = 1  # Could add login/user selection if needed
         self.initialize_session_state()
-        self.setup_page_config()
         self.load_user_baselines()
 
     def initialize_session_state(self):
@@ -41,82 +142,101 @@ class RealTimeHealthDashboard:
     def load_user_baselines(self):
         """Load user baseline settings from the database."""
         baselines = self.db_manager.get_user_baselines(self.user_id)
-        st.session_state.personal_baselines = baselines
+        # One DataFrame indexed by metric instead of a dict-of-dicts: chart
+        # code pays a single .loc[metric] lookup and the sidebar edits every
+        # baseline through one bulk widget
+        st.session_state.baselines_df = pd.DataFrame.from_dict(
+            baselines, orient='index', columns=['target', 'min', 'max']
+        ) if baselines else pd.DataFrame(columns=['target', 'min', 'max'])
+
+    def get_baseline(self, metric):
+        """Return the baseline row for a metric as a dict ({} if unset)."""
+        df = st.session_state.baselines_df
+        if metric in df.index:
+            return df.loc[metric].to_dict()
+        return {}
 
     def create_customization_sidebar(self):
         """Build sidebar with dashboard controls."""
         st.sidebar.header("🎛️ Dashboard Customization")
         available_metrics = self.db_manager.get_available_metrics()
-        selected_metrics = st.sidebar.multiselect(
-            "Choose Primary Metrics",
-            available_metrics,
-            default=st.session_state.metric_preferences.get('primary_metrics', available_metrics[:3])
-        )
-        st.session_state.metric_preferences['primary_metrics'] = selected_metrics
+        prefs = st.session_state.metric_preferences
 
-        viz_type = st.sidebar.selectbox(
-            "Chart Type",
-            ["line", "gauge", "area", "bar"],
-            index=["line", "gauge", "area", "bar"].index(
-                st.session_state.metric_preferences['visualization_type']
+        # A form batches every widget change into a single rerun on Apply,
+        # instead of one full rerun per widget interaction
+        with st.sidebar.form("dashboard_customization"):
+            selected_metrics = st.multiselect(
+                "Choose Primary Metrics",
+                available_metrics,
+                default=prefs.get('primary_metrics', available_metrics[:3])
             )
-        )
-        st.session_state.metric_preferences['visualization_type'] = viz_type
 
-        theme = st.sidebar.selectbox(
-            "Color Theme",
-            ['default', 'dark', 'pastel', 'health', 'clinical'],
-            index=['default', 'dark', 'pastel', 'health', 'clinical'].index(
-                st.session_state.metric_preferences['color_theme']
+            viz_type = st.selectbox(
+                "Chart Type",
+                ["line", "gauge", "area", "bar"],
+                index=["line", "gauge", "area", "bar"].index(
+                    prefs['visualization_type']
+                )
             )
-        )
-        st.session_state.metric_preferences['color_theme'] = theme
 
-        time_range = st.sidebar.selectbox(
-            "Display Period",
-            ["1h", "6h", "12h", "24h", "7d", "30d"],
-            index=["1h", "6h", "12h", "24h", "7d", "30d"].index(
-                st.session_state.metric_preferences['time_range']
+            theme = st.selectbox(
+                "Color Theme",
+                ['default', 'dark', 'pastel', 'health', 'clinical'],
+                index=['default', 'dark', 'pastel', 'health', 'clinical'].index(
+                    prefs['color_theme']
+                )
             )
-        )
-        st.session_state.metric_preferences['time_range'] = time_range
-
-        update_freq = st.sidebar.slider(
-            "Update Frequency (seconds)",
-            min_value=5,
-            max_value=300,
-            value=st.session_state.metric_preferences['update_frequency'],
-            step=5
-        )
-        st.session_state.metric_preferences['update_frequency'] = update_freq
 
-        return selected_metrics, viz_type, theme, time_range, update_freq
+            time_range = st.selectbox(
+                "Display Period",
+                ["1h", "6h", "12h", "24h", "7d", "30d"],
+                index=["1h", "6h", "12h", "24h", "7d", "30d"].index(
+                    prefs['time_range']
+                )
+            )
+
+            update_freq = st.slider(
+                "Update Frequency (seconds)",
+                min_value=5,
+                max_value=300,
+                value=prefs['update_frequency'],
+                step=5
+            )
+
+            submitted = st.form_submit_button("Apply")
+
+        if submitted:
+            prefs.update({
+                'primary_metrics': selected_metrics,
+                'visualization_type': viz_type,
+                'color_theme': theme,
+                'time_range': time_range,
+                'update_frequency': update_freq
+            })
+
+        return (prefs['primary_metrics'], prefs['visualization_type'],
+                prefs['color_theme'], prefs['time_range'], prefs['update_frequency'])
 
     def create_baseline_configuration(self):
         """Let users adjust baselines (persist changes to DB as enhancement)."""
         st.sidebar.subheader("🎯 Personal Baselines")
-        # For now: display DB-loaded baselines; editing can be added if you desire
-        for metric in st.session_state.metric_preferences['primary_metrics']:
-            b = st.session_state.personal_baselines.get(metric, {})
-            with st.sidebar.expander(f"{metric.replace('_', ' ').title()} Baseline"):
-                st.write(f"**Target:** {b.get('target', 'N/A')}")
-                st.write(f"**Min Threshold:** {b.get('min', 'N/A')}")
-                st.write(f"**Max Threshold:** {b.get('max', 'N/A')}")
+        # One data_editor over the whole baseline table replaces the
+        # per-metric expander/slider stack, so a rerun instantiates a single
+        # widget instead of three per metric
+        edited = st.sidebar.data_editor(
+            st.session_state.baselines_df,
+            key="baseline_editor",
+            use_container_width=True
+        )
+        st.session_state.baselines_df = edited
 
     def get_color_palette(self, theme):
-        color_themes = {
-            'default': px.colors.qualitative.Set1,
-            'dark': px.colors.qualitative.Dark2,
-            'pastel': px.colors.qualitative.Pastel1,
-            'health': ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57'],
-            'clinical': ['#2C3E50', '#E74C3C', '#3498DB', '#2ECC71', '#F39C12']
-        }
-        return color_themes.get(theme, px.colors.qualitative.Set1)
+        return _COLOR_THEMES.get(theme, _COLOR_THEMES['default'])
 
     def load_data_from_db(self, metric):
         """Load real data for the metric from database."""
         time_range = st.session_state.metric_preferences['time_range']
-        hours = {'1h': 1, '6h': 6, '12h': 12, '24h': 24, '7d': 168, '30d': 720}[time_range]
+        hours = _hours_for_range(time_range)
         s = self.db_manager.get_metric_data(metric, hours, self.user_id)
         # If data empty, fallback to a dummy Series (to avoid breaking plots)
         if s.empty:
@@ -126,63 +246,15 @@ class RealTimeHealthDashboard:
         return s
 
     def create_real_time_chart(self, metric_name, data, chart_type, color_theme):
-        colors = self.get_color_palette(color_theme)
-        baseline = st.session_state.personal_baselines.get(metric_name, {})
-        # The chart plotting code (line, gauge, area, or bar) can be reused from earlier examples
-        # For brevity, I'll provide just the line chart as core template; extend with gauges, bars if desired
-        if chart_type == "gauge":
-            current_value = data.dropna().iloc[-1] if len(data.dropna()) > 0 else 0
-            target = baseline.get('target', 50)
-            min_val = baseline.get('min', 0)
-            max_val = baseline.get('max', 100)
-            gauge_max = max_val * 1.2
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=current_value,
-                delta={'reference': target, 'position': "top"},
-                title={'text': f"{metric_name.replace('_', ' ').title()}"},
-                gauge={
-                    'axis': {'range': [None, gauge_max]},
-                    'bar': {'color': colors[0]},
-                    'steps': [
-                        {'range': [0, min_val], 'color': "lightcoral"},
-                        {'range': [min_val, target], 'color': "lightgreen"},
-                        {'range': [target, max_val], 'color': "gold"},
-                        {'range': [max_val, gauge_max], 'color': "lightcoral"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': target
-                    }
-                }
-            ))
-            fig.update_layout(height=300)
-            return fig
-
-        else:  # default to line chart
-            fig = go.Figure()
-            if baseline:
-                fig.add_hrect(y0=baseline.get('min', 0), y1=baseline.get('target', 50),
-                              fillcolor="lightgreen", opacity=0.2, line_width=0)
-                fig.add_hline(y=baseline.get('target', 50), line_dash="dash",
-                              line_color=colors[0], annotation_text="Target")
-            fig.add_trace(go.Scatter(
-                x=data.index,
-                y=data.values,
-                mode='lines+markers',
-                name=metric_name.replace('_', ' ').title(),
-                line=dict(color=colors[0], width=3),
-                marker=dict(size=6)
-            ))
-            fig.update_layout(
-                title=f"Real-Time {metric_name.replace('_', ' ').title()}",
-                xaxis_title="Time",
-                yaxis_title=metric_name.replace('_', ' ').title(),
-                height=400,
-                showlegend=False
-            )
-            return fig
+        baseline = self.get_baseline(metric_name)
+        # Delegate to the cached module-level builder; figure assembly only
+        # reruns when the data or one of the styling knobs actually changed
+        return _build_figure(
+            metric_name,
+            data.index.to_numpy(), data.to_numpy(),
+            chart_type, color_theme,
+            baseline.get('target'), baseline.get('min'), baseline.get('max')
+        )
 
     def create_adaptive_layout(self):
         """Main dashboard metrics and plots."""
@@ -205,7 +277,7 @@ class RealTimeHealthDashboard:
                 st.plotly_chart(fig, use_container_width=True)
             with col2:
                 current_value = data.dropna().iloc[-1] if len(data.dropna()) > 0 else None
-                baseline = st.session_state.personal_baselines.get(metric, {})
+                baseline = self.get_baseline(metric)
                 st.metric("Current", f"{current_value:.1f}" if current_value is not None else "No Data")
                 st.metric("Target", f"{baseline.get('target', 'N/A')}")
                 if len(data.dropna()) > 1:
@@ -225,7 +297,7 @@ class RealTimeHealthDashboard:
                 alerts.append({"metric": metric, "msg": "No data available", "severity": "low"})
                 continue
             current_value = data.dropna().iloc[-1]
-            b = st.session_state.personal_baselines.get(metric, {})
+            b = self.get_baseline(metric)
             if current_value < b.get('min', -np.inf):
                 alerts.append({"metric": metric, "msg": f"Below minimum ({b.get('min')})", "severity": "high"})
             elif current_value > b.get('max', np.inf):
@@ -1,4 +1,7 @@
 import sqlite3
+import threading
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
@@ -6,36 +9,124 @@ from typing import List, Dict, Optional
 class HealthDataManager:
     def __init__(self, db_path='C:/smakrykoDBs/health_metrics.db'):
         self.db_path = db_path
-    
+        # One shared connection instead of a fresh sqlite3.connect per query:
+        # the dashboard reads several metrics per rerun and was paying the
+        # file-open and journal-init cost each time. WAL plus the cache/mmap
+        # pragmas tune the connection for read-heavy access; writes are rare
+        # and serialized through the lock.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-65536")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._write_lock = threading.Lock()
+        # Process-local cache for the rarely-changing lookups (baselines,
+        # metric list); dashboards ask for these on every render
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._metrics_version = 0
+        # The range queries filter on (metric_name, timestamp); this index
+        # turns them into a log-N probe plus a scan of the returned rows
+        try:
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_hd_metric_time"
+                " ON health_data(metric_name, timestamp)"
+            )
+            # Without fresh statistics the planner may still pick a scan
+            self._conn.execute("ANALYZE")
+            # Small materialized list of metric names, maintained by the
+            # write paths, so listing metrics never scans health_data.
+            # Seeded from existing rows to cover data written by scripts
+            # that predate the catalog (e.g. create_database.py samples).
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metrics_catalog"
+                " (metric_name TEXT PRIMARY KEY)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO metrics_catalog"
+                " SELECT DISTINCT metric_name FROM health_data"
+            )
+            self._conn.commit()
+        except sqlite3.OperationalError:
+            pass  # table not created yet; create_database.py builds indexes
+
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get the shared database connection"""
+        return self._conn
+
+    _CACHE_TTL = 60  # seconds before a cached lookup is reloaded
+
+    def _cached(self, key, loader):
+        """Serve key from the process-local cache, reloading after the TTL"""
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[1] > now:
+                return hit[0]
+        value = loader()
+        with self._cache_lock:
+            if len(self._cache) >= 256:
+                # Version-keyed entries are never overwritten, so sweep the
+                # expired ones instead of growing without bound
+                self._cache = {k: v for k, v in self._cache.items()
+                               if v[1] > now}
+            self._cache[key] = (value, now + self._CACHE_TTL)
+        return value
     
     def get_metric_data(self, metric_name: str, hours: int = 24, user_id: int = 1) -> pd.Series:
-        """Get time series data for a specific metric"""
-        
+        """Get time series data for a specific metric.
+
+        Served from the process cache between refreshes: the key carries the
+        write version, so inserts invalidate immediately, while the cache
+        TTL bounds how stale the trailing time window can drift. Callers
+        treat the Series as read-only.
+        """
+        return self._cached(
+            ('series', metric_name, hours, self._metrics_version),
+            lambda: self._load_metric_series(metric_name, hours))
+
+    def _load_metric_series(self, metric_name: str, hours: int) -> pd.Series:
         with self.get_connection() as conn:
             query = """
-            SELECT timestamp, metric_value 
-            FROM health_data 
-            WHERE metric_name = ? 
-            AND timestamp >= datetime('now', '-{} hours')
+            SELECT timestamp, metric_value
+            FROM health_data
+            WHERE metric_name = ?
+            AND timestamp >= ?
             ORDER BY timestamp
-            """.format(hours)
-            
-            df = pd.read_sql_query(
-                query, 
-                conn, 
-                params=[metric_name],
-                parse_dates=['timestamp'], 
-                index_col='timestamp'
+            """
+
+            # Computing the cutoff here keeps the filter a plain indexed
+            # range comparison that SQLite can satisfy from idx_hd_metric_time.
+            # ISO-8601 text orders lexicographically like the instants it
+            # encodes, so the >= is a byte-wise compare on the B-tree with no
+            # per-row date conversion
+            cutoff = (datetime.now() - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
+
+            # Straight cursor fetch instead of pd.read_sql_query: the caller
+            # only wants a Series, so the intermediate DataFrame with its
+            # dtype inference and block allocation is pure overhead
+            rows = conn.execute(query, [metric_name, cutoff]).fetchall()
+
+            if not rows:
+                return pd.Series(dtype=np.float32)
+
+            timestamps, values = zip(*rows)
+            # Parse the uniform ISO timestamps in one vectorized pass;
+            # float32 is plenty for health metrics and halves series memory
+            return pd.Series(
+                np.fromiter(values, dtype=np.float32, count=len(rows)),
+                index=pd.to_datetime(timestamps, format='ISO8601', cache=True),
+                name=metric_name
             )
-            
-            return df['metric_value'] if not df.empty else pd.Series()
     
     def get_user_baselines(self, user_id: int = 1) -> Dict:
-        """Get personal baselines for a user"""
-        
+        """Get personal baselines for a user (cached; they change rarely)"""
+        return self._cached(('baselines', user_id),
+                            lambda: self._load_user_baselines(user_id))
+
+    def _load_user_baselines(self, user_id: int) -> Dict:
         with self.get_connection() as conn:
             query = """
             SELECT metric_name, target_value, min_threshold, max_threshold
@@ -57,44 +148,110 @@ class HealthDataManager:
             
             return baselines
     
-    def insert_health_data(self, metric_name: str, value: float, 
+    def insert_health_data_bulk(self, rows: List[tuple]):
+        """Insert many (timestamp, metric_name, value, device_id) rows at once.
+
+        One executemany inside a single transaction pays the statement
+        dispatch and commit fsync once for the whole batch; a Garmin sync
+        dumping thousands of samples should come through here, not the
+        single-row helper.
+        """
+        with self._write_lock, self.get_connection() as conn:
+            conn.executemany("""
+            INSERT OR REPLACE INTO health_data (timestamp, metric_name, metric_value, device_id)
+            VALUES (?, ?, ?, ?)
+            """, rows)
+
+            conn.executemany(
+                "INSERT OR IGNORE INTO metrics_catalog VALUES (?)",
+                {(r[1],) for r in rows}
+            )
+
+            conn.commit()
+
+        # New rows may introduce new metric names; retire the cached list
+        self._metrics_version += 1
+
+    def insert_health_data(self, metric_name: str, value: float,
                           timestamp: Optional[datetime] = None, device_id: str = 'manual'):
         """Insert a single health data point"""
-        
+
         if timestamp is None:
             timestamp = datetime.now()
-        
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-            INSERT OR REPLACE INTO health_data (timestamp, metric_name, metric_value, device_id)
-            VALUES (?, ?, ?, ?)
-            """, (timestamp, metric_name, value, device_id))
-            
-            conn.commit()
+
+        # Store the canonical second-resolution format every other writer
+        # uses; a raw str(datetime) would carry microseconds and break the
+        # column's uniform byte-wise ordering
+        ts = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        self.insert_health_data_bulk([(ts, metric_name, value, device_id)])
     
     def get_available_metrics(self) -> List[str]:
-        """Get list of available metrics in the database"""
-        
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT metric_name FROM health_data ORDER BY metric_name")
-            
-            return [row[0] for row in cursor.fetchall()]
+        """Get list of available metrics in the database.
+
+        Cached keyed on a version counter that the write path bumps, so a
+        sync introducing a brand-new metric shows up immediately while
+        ordinary reads never touch SQLite. On a miss the read comes from
+        the metrics_catalog table — O(number of metrics), not a DISTINCT
+        scan over the history.
+        """
+        def load():
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT metric_name FROM metrics_catalog ORDER BY metric_name")
+                return [row[0] for row in cursor.fetchall()]
+
+        return self._cached(('metrics', self._metrics_version), load)
     
+    def get_weekly_aggregates(self, metrics: List[str], weeks: int = 13) -> pd.DataFrame:
+        """Weekly per-metric averages, aggregated inside SQLite.
+
+        A weekly heatmap only needs ~weeks x metrics numbers, so let the
+        GROUP BY reduce the rows during the index scan instead of
+        materializing the full history in pandas first. Returns a frame
+        indexed by ISO year-week with one column per requested metric,
+        ready for sns.heatmap(df.T).
+        """
+        cutoff = (datetime.now() - timedelta(weeks=weeks)).strftime('%Y-%m-%d %H:%M:%S')
+        placeholders = ','.join('?' * len(metrics))
+        query = f"""
+        SELECT strftime('%Y-%W', timestamp) AS week,
+               metric_name,
+               AVG(metric_value) AS avg_value
+        FROM health_data
+        WHERE metric_name IN ({placeholders})
+        AND timestamp >= ?
+        GROUP BY week, metric_name
+        ORDER BY week
+        """
+
+        with self.get_connection() as conn:
+            rows = conn.execute(query, [*metrics, cutoff]).fetchall()
+
+        if not rows:
+            return pd.DataFrame(columns=metrics)
+
+        df = pd.DataFrame(rows, columns=['week', 'metric_name', 'avg_value'])
+        return (df.pivot(index='week', columns='metric_name', values='avg_value')
+                  .reindex(columns=metrics))
+
     def get_latest_values(self, user_id: int = 1) -> Dict:
         """Get the latest value for each metric"""
         
         with self.get_connection() as conn:
+            # One grouped MAX over the (metric_name, timestamp) index joined
+            # back to the rows, instead of the correlated subquery that
+            # re-scans health_data for every candidate row
             query = """
-            SELECT metric_name, metric_value, timestamp
-            FROM health_data hd1
-            WHERE timestamp = (
-                SELECT MAX(timestamp) 
-                FROM health_data hd2 
-                WHERE hd2.metric_name = hd1.metric_name
-            )
-            ORDER BY metric_name
+            SELECT hd.metric_name, hd.metric_value, hd.timestamp
+            FROM health_data hd
+            JOIN (
+                SELECT metric_name, MAX(timestamp) AS ts
+                FROM health_data
+                GROUP BY metric_name
+            ) latest
+              ON hd.metric_name = latest.metric_name
+             AND hd.timestamp = latest.ts
+            ORDER BY hd.metric_name
             """
             
             cursor = conn.cursor()